@@ -0,0 +1,38 @@
+"""Drop tool_outputs table
+
+Revision ID: a3d91f6c2b57
+Revises: 5e2b7c9d41a8
+Create Date: 2024-10-21 09:32:17.648205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d91f6c2b57'
+down_revision: Union[str, None] = '5e2b7c9d41a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index(op.f('ix_tool_outputs_run_id'), table_name='tool_outputs')
+    op.drop_table('tool_outputs')
+
+
+def downgrade() -> None:
+    op.create_table('tool_outputs',
+    sa.Column('tool_call_id', sa.String(length=64), nullable=False),
+    sa.Column('run_id', sa.String(length=64), nullable=False),
+    sa.Column('thread_id', sa.String(length=32), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('arguments', sa.Text(), nullable=True),
+    sa.Column('output', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['thread_id'], ['threads.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('tool_call_id')
+    )
+    op.create_index(op.f('ix_tool_outputs_run_id'), 'tool_outputs', ['run_id'], unique=False)
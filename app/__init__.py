@@ -11,9 +11,16 @@ from app.routes.agent.agent import agent_bp
 from app.routes.metrics.healthcheck import healthcheck_bp
 from flask_cors import CORS
 from flasgger import Swagger
+from app.utils.logger import setup_logging
+from app.utils.request import UploadRequest
+from config import SessionLocal
 
 def create_app():
+    setup_logging()
     app = Flask(__name__)
+    app.request_class = UploadRequest
+    # Largest accepted request body; OpenAI rejects files over 512 MB anyway
+    app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_CONTENT_LENGTH', 512 * 1024 * 1024))
     CORS(app)
 
     app.static_folder = 'static'
@@ -57,5 +64,13 @@ def create_app():
     app.register_blueprint(messages_bp)
     app.register_blueprint(agent_bp)
     app.register_blueprint(healthcheck_bp)
+
+    # Routes are fixed once blueprints are registered, so count them once for the welcome page
+    app.config['ROUTES_COUNT'] = len(list(app.url_map.iter_rules()))
+
+    @app.teardown_appcontext
+    def remove_db_session(exception=None):
+        SessionLocal.remove()
+
     return app
 
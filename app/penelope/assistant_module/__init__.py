@@ -2,14 +2,18 @@
 This module provides a manager for interacting with assistants module.
 """
 
+from functools import lru_cache
 from .assistant import AssistantManager
 
-__all__ = ['AssistantManager']
+__all__ = ['AssistantManager', 'get_manager']
 __version__ = '0.1.0'
 __author__ = 'David'
 
-# Assistant manager initialization
-manager = AssistantManager(verbose=True)
+# Assistant manager initialization, deferred to first use so importing the
+# package doesn't build an OpenAI client (or require OPENAI_API_KEY)
+@lru_cache(maxsize=None)
+def get_manager() -> AssistantManager:
+    return AssistantManager(verbose=True)
 
 # Assistant initialization parameters
 assistant_name = 'penelope'
@@ -124,6 +128,8 @@ tools=[ {"type": "code_interpreter"},
 
 # Usage examples
 
+# manager = get_manager()
+
 # Create assistant
 # assistant = manager.create_assistant(assistant_name, model, system_instructions, tools)
 # print('assistant: ', assistant)
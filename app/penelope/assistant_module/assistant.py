@@ -3,12 +3,21 @@
 """
 
 from app.utils.response_template import method_response_template
+from app.utils.http_client import openai_http_client
 from typing import List, Dict, Any, Optional
 from werkzeug.utils import secure_filename
+from cachetools import TTLCache
 from openai import OpenAI
+import threading
+import logging
 import time
 import os
 
+logger = logging.getLogger(__name__)
+
+# Seconds a successful list_assistants result is reused before OpenAI is asked again
+ASSISTANTS_CACHE_TTL = int(os.getenv("ASSISTANTS_CACHE_TTL", 60))
+
 class AssistantManager:
     def __init__(self, api_key: Optional[str] = None, verbose: bool = False):
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
@@ -16,12 +25,15 @@ class AssistantManager:
         if not self.api_key:
             raise ValueError("OpenAI API key not provided and OPENAI_API_KEY environment variable not set")
 
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = OpenAI(api_key=self.api_key, http_client=openai_http_client)
         self.verbose = verbose
+        # Assistants only change through this manager, so writes below clear the cache
+        self._list_cache = TTLCache(maxsize=64, ttl=ASSISTANTS_CACHE_TTL)
+        self._list_cache_lock = threading.Lock()
 
     def log_debug(self, message: str, *args, **kwargs):
         if self.verbose:
-            print(f"DEBUG: {message}", *args, **kwargs)
+            logger.debug(message, *args, **kwargs)
 
     def create_assistant(self, model: str, name: str, instructions: str, 
                          tools: Optional[List[Dict[str, Any]]] = None, 
@@ -50,13 +62,14 @@ class AssistantManager:
                 tools=tools or [],
                 temperature=temperature
             )
+            self.invalidate_list_cache()
             return method_response_template(message="Assistant created successfully", 
                                              data=assistant.model_dump(), 
                                              success=True
                                              )
         except Exception as e:
-            self.log_debug(f"Error creating assistant: {str(e)}")
-            self.log_debug(f"Assistant creation parameters: model={model}, name={name}, instructions={instructions}, tools={tools}, temperature={temperature}")
+            self.log_debug("Error creating assistant: %s", e)
+            self.log_debug("Assistant creation parameters: model=%s, name=%s, instructions=%s, tools=%s, temperature=%s", model, name, instructions, tools, temperature)
             return method_response_template(message=f"Failed to create assistant: {str(e)}", 
                                              data={"model": model, "name": name, "instructions": instructions, "tools": tools, "temperature": temperature}, 
                                              success=False
@@ -82,24 +95,38 @@ class AssistantManager:
             if order not in ["asc", "desc"]:
                 raise ValueError("Invalid order. Must be 'asc' or 'desc'.")
 
+            cache_key = (limit, order, after)
+            with self._list_cache_lock:
+                cached = self._list_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
             assistants = self.client.beta.assistants.list(limit=limit, order=order, after=after)
             assistant_list = [assistant.model_dump() for assistant in assistants.data]
 
-            print("len:", len(assistant_list))
-
-            self.log_debug(f"Successfully retrieved {len(assistant_list)} assistants.")
-            return method_response_template(message=f"Successfully retrieved {len(assistant_list)} assistants.", 
+            self.log_debug("Successfully retrieved %s assistants.", len(assistant_list))
+            result = method_response_template(message=f"Successfully retrieved {len(assistant_list)} assistants.", 
                                              data=assistant_list, 
                                              success=True
                                              )
+            with self._list_cache_lock:
+                self._list_cache[cache_key] = result
+            return result
         
         except Exception as e:
-            self.log_debug(f"Error listing assistants: {str(e)}")
+            self.log_debug("Error listing assistants: %s", e)
             return method_response_template(message=f"Failed to list assistants: {str(e)}", 
                                              data={"limit": limit, "order": order, "after": after}, 
                                              success=False
                                              )
 
+    def invalidate_list_cache(self) -> None:
+        """
+        Drop cached list_assistants results so the next call reads from OpenAI.
+        """
+        with self._list_cache_lock:
+            self._list_cache.clear()
+
     def delete_assistant(self, assistant_id: str) -> Dict[str, Any]:
         """
         Delete an assistant by its ID.
@@ -114,15 +141,16 @@ class AssistantManager:
             AssistantDeletionError: If there's an error during the deletion process.
         """
         try:
-            self.log_debug(f"Attempting to delete assistant with ID: {assistant_id}")
+            self.log_debug("Attempting to delete assistant with ID: %s", assistant_id)
             deleted_assistant = self.client.beta.assistants.delete(assistant_id)
-            self.log_debug(f"Successfully deleted assistant with ID: {assistant_id}")
+            self.log_debug("Successfully deleted assistant with ID: %s", assistant_id)
+            self.invalidate_list_cache()
             return method_response_template(message="Successfully deleted assistant", 
                                              data=deleted_assistant.model_dump(), 
                                              success=True
                                              )
         except Exception as e:
-            self.log_debug(f"Error deleting assistant with ID {assistant_id}: {str(e)}")
+            self.log_debug("Error deleting assistant with ID %s: %s", assistant_id, e)
             return method_response_template(message=f"Failed to delete assistant: {str(e)}", 
                                              data={"assistant_id": assistant_id}, 
                                              success=False
@@ -144,15 +172,16 @@ class AssistantManager:
             AssistantError: If there's an error during the update process.
         """
         try:
-            self.log_debug(f"Attempting to update assistant with ID: {assistant_id}")
+            self.log_debug("Attempting to update assistant with ID: %s", assistant_id)
             updated_assistant = self.client.beta.assistants.update(assistant_id, **kwargs)
-            self.log_debug(f"Successfully updated assistant with ID: {assistant_id}")
+            self.log_debug("Successfully updated assistant with ID: %s", assistant_id)
+            self.invalidate_list_cache()
             return method_response_template(message="Successfully updated assistant", 
                                              data=updated_assistant.model_dump(), 
                                              success=True
                                              )
         except Exception as e:
-            self.log_debug(f"Error updating assistant with ID {assistant_id}: {str(e)}")
+            self.log_debug("Error updating assistant with ID %s: %s", assistant_id, e)
             return method_response_template(message=f"Failed to update assistant: {str(e)}", 
                                              data={"assistant_id": assistant_id, "details": kwargs}, 
                                              success=False
@@ -162,17 +191,18 @@ class AssistantManager:
         try:
             # Step 1: Create a Thread
             thread = self.client.beta.threads.create()
-            self.log_debug(f"Creating a thread for assistant with ID: {assistant_id}")
+            self.log_debug("Creating a thread for assistant with ID: %s", assistant_id)
 
             # Step 2: Upload Files and Get their IDs
             attachments = []
             if files:
                 for file in files:
                     filename = secure_filename(file.filename)
-                    self.log_debug(f"Uploading file: {filename}")
+                    self.log_debug("Uploading file: %s", filename)
                     purpose = "vision" if filename.lower().endswith(('.png', '.jpg', '.jpeg', '.gif')) else "assistants"
-                    response = self.client.files.create(file=file, purpose=purpose)
-                    self.log_debug(f"File response: {response}")
+                    file.stream.seek(0)
+                    response = self.client.files.create(file=(filename, file.stream, file.content_type), purpose=purpose)
+                    self.log_debug("File response: %s", response)
                     attachments.append({"file_id": response.id})
 
             # Step 3: Add a Message with Attachments to the Thread
@@ -182,32 +212,24 @@ class AssistantManager:
                 content=message,
                 attachments=attachments
             )
-            self.log_debug(f"Adding a message with attachments to the thread: {thread.id}")
+            self.log_debug("Adding a message with attachments to the thread: %s", thread.id)
 
-            # Step 4: Run the Assistant on the Thread
-            run = self.client.beta.threads.runs.create(
+            # Step 4: Run the Assistant on the Thread over a single streamed
+            # connection; the completed messages come back on the stream itself, so
+            # there is no status polling and no follow-up messages.list call.
+            with self.client.beta.threads.runs.stream(
                 thread_id=thread.id,
                 assistant_id=assistant_id
-            )
-            self.log_debug(f"Creating a run for the thread: {thread.id}")
-
-            # Polling for run completion
-            while True:
-                run_status = self.client.beta.threads.runs.retrieve(thread_id=thread.id, run_id=run.id)
-                self.log_debug(f"Run status: {run_status.status}")
-                if run_status.status == "completed":
-                    break
-                elif run_status.status == "failed":
-                    raise Exception("Run failed")
-                time.sleep(1)  # Wait before checking again
-            self.log_debug(f"Polling for run completion: {run.id}")
-
-            # Fetching all messages from the thread after completion
-            messages = self.client.beta.threads.messages.list(thread_id=thread.id)
-            self.log_debug(f"Fetching all messages from the thread after completion: {thread.id}")
+            ) as stream:
+                stream.until_done()
+                run = stream.get_final_run()
+                final_messages = stream.get_final_messages()
+            self.log_debug("Run %s finished with status: %s", run.id, run.status)
+            if run.status != "completed":
+                raise Exception(f"Run {run.status}")
 
             # Extracting the assistant's latest response
-            assistant_messages = [msg for msg in messages.data if msg.role == 'assistant']
+            assistant_messages = [msg for msg in final_messages if msg.role == 'assistant']
             if not assistant_messages:
                 raise Exception("No response from assistant")
 
@@ -223,7 +245,7 @@ class AssistantManager:
                 for block in response_content_blocks if block.type == 'text'
             ]
 
-            self.log_debug(f"Assistant's response text and annotations: {response_data}")
+            self.log_debug("Assistant's response text and annotations: %s", response_data)
 
             return method_response_template(
                 message="Successfully asked assistant",
@@ -231,7 +253,7 @@ class AssistantManager:
                 success=True
             )
         except Exception as e:
-            self.log_debug(f"Error asking assistant with ID {assistant_id}: {str(e)}")
+            self.log_debug("Error asking assistant with ID %s: %s", assistant_id, e)
             return method_response_template(
                 message=f"Failed to ask assistant: {str(e)}",
                 data={"assistant_id": assistant_id, "message": message},
@@ -242,7 +264,7 @@ class AssistantManager:
         try:
             # Step 1: Create a Thread
             thread = self.client.beta.threads.create()
-            self.log_debug(f"Creating a thread for assistant with ID: {assistant_id}")
+            self.log_debug("Creating a thread for assistant with ID: %s", assistant_id)
 
             # Step 2: Upload Files and Get their IDs
             attachments = []
@@ -259,14 +281,14 @@ class AssistantManager:
                 content=message,
                 attachments=attachments
             )
-            self.log_debug(f"Adding a message with attachments to the thread: {thread.id}")
+            self.log_debug("Adding a message with attachments to the thread: %s", thread.id)
 
             # Step 4: Run the Assistant on the Thread
             run = self.client.beta.threads.runs.create(
                 thread_id=thread.id,
                 assistant_id=assistant_id
             )
-            self.log_debug(f"Creating a run for the thread: {thread.id}")
+            self.log_debug("Creating a run for the thread: %s", thread.id)
 
             # Polling for run completion
             while True:
@@ -276,11 +298,11 @@ class AssistantManager:
                 elif run_status.status == "failed":
                     raise Exception("Run failed")
                 time.sleep(1)  # Wait before checking again
-            self.log_debug(f"Polling for run completion: {run.id}")
+            self.log_debug("Polling for run completion: %s", run.id)
 
             # Fetching all messages from the thread after completion
             messages = self.client.beta.threads.messages.list(thread_id=thread.id)
-            self.log_debug(f"Fetching all messages from the thread after completion: {thread.id}")
+            self.log_debug("Fetching all messages from the thread after completion: %s", thread.id)
 
             # Extracting the assistant's latest response
             assistant_messages = [msg for msg in messages.data if msg.role == 'assistant']
@@ -300,7 +322,7 @@ class AssistantManager:
                 if block.type == 'text'
             ]
 
-            self.log_debug(f"Assistant's response text and annotations: {response_data}")
+            self.log_debug("Assistant's response text and annotations: %s", response_data)
 
             return method_response_template(
                 message="Successfully asked assistant",
@@ -308,7 +330,7 @@ class AssistantManager:
                 success=True
             )
         except Exception as e:
-            self.log_debug(f"Error asking assistant with ID {assistant_id}: {str(e)}")
+            self.log_debug("Error asking assistant with ID %s: %s", assistant_id, e)
             return method_response_template(
                 message=f"Failed to ask assistant: {str(e)}",
                 data={"assistant_id": assistant_id, "message": message},
@@ -0,0 +1,27 @@
+"""
+# Initialization of the batch package
+"""
+
+from .batch import BatchManager
+
+__all__ = ['BatchManager']
+__version__ = '0.1.0'
+__author__ = 'David'
+
+# Example usage of the batch manager
+
+# manager = BatchManager(verbose=True)
+
+# Submit a batch of chat completions
+# batch = manager.submit_batch([
+#     {"custom_id": "summary-1", "body": {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "Summarize..."}]}},
+# ])
+# print("batch: ", batch)
+
+# Check the batch status
+# status = manager.get_batch(batch_id=batch["data"]["id"])
+# print("status: ", status)
+
+# Collect the results once completed
+# results = manager.get_batch_results(batch_id=batch["data"]["id"])
+# print("results: ", results)
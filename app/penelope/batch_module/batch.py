@@ -0,0 +1,255 @@
+"""
+# Batch module: submit, inspect and collect OpenAI Batch API jobs, used for non-interactive work that can wait for results.
+"""
+
+from app.utils.response_template import method_response_template
+from app.utils.http_client import openai_http_client
+from typing import List, Dict, Any, Optional
+from openai import OpenAI
+import logging
+import orjson
+import time
+import uuid
+import io
+import os
+
+class BatchManager:
+    # A batch in one of these states will not process any more requests
+    FINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+    def __init__(self, api_key: Optional[str] = None, verbose: bool = False):
+
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        if not self.api_key:
+            raise ValueError("OpenAI API key not provided and OPENAI_API_KEY environment variable not set")
+
+        self.verbose = verbose
+        self.client = OpenAI(api_key=self.api_key, http_client=openai_http_client)
+        self.logger = logging.getLogger(__name__)
+
+    def log_debug(self, message: str, *args, **kwargs):
+        if self.verbose:
+            self.logger.debug(message, *args, **kwargs)
+
+    def submit_batch(self, requests: List[Dict[str, Any]],
+                     endpoint: str = "/v1/chat/completions",
+                     completion_window: str = "24h",
+                     metadata: Optional[Dict[str, str]] = None
+                     ) -> Dict[str, Any]:
+        """
+        Upload a set of requests as a JSONL file and create a batch job for them.
+
+        Batch jobs are billed at half the synchronous price and do not count
+        against the interactive rate limits, so they suit work nobody is waiting on.
+
+        Args:
+            requests (List[Dict[str, Any]]): Request bodies for `endpoint`. Each item is either a
+                plain body, or a dict with `custom_id` and `body` keys.
+            endpoint (str): The API endpoint every request targets. Defaults to chat completions.
+            completion_window (str): The time frame within which the batch must be processed.
+            metadata (Optional[Dict[str, str]]): Optional metadata attached to the batch.
+
+        Returns:
+            Dict[str, Any]: A dictionary containing the details of the created batch.
+        """
+        try:
+            lines = []
+            for index, request in enumerate(requests):
+                body = request.get("body", request)
+                custom_id = request.get("custom_id", f"request-{index}")
+                lines.append(orjson.dumps({"custom_id": custom_id, "method": "POST", "url": endpoint, "body": body}))
+
+            batch_input = self.client.files.create(
+                file=("batch_input.jsonl", io.BytesIO(b"\n".join(lines)), "application/jsonl"),
+                purpose="batch"
+            )
+            batch = self.client.batches.create(
+                input_file_id=batch_input.id,
+                endpoint=endpoint,
+                completion_window=completion_window,
+                metadata=metadata
+            )
+            self.log_debug("Batch %s created with %s requests", batch.id, len(lines))
+            return method_response_template(message="Batch created successfully",
+                                             data=batch.model_dump(mode="json"),
+                                             success=True
+                                             )
+        except Exception as e:
+            error_message = f"Error creating batch: {str(e)}"
+            self.log_debug(error_message)
+            return method_response_template(message=error_message,
+                                             data=None,
+                                             success=False
+                                             )
+
+    def submit_prompts(self, prompts: List[str],
+                       system_prompt: Optional[str] = None,
+                       model: str = "gpt-4o",
+                       temperature: float = 0.7,
+                       max_tokens: int = 1024
+                       ) -> Dict[str, Any]:
+        """
+        Submit a list of prompts as one chat completions batch.
+
+        Args:
+            prompts (List[str]): The user prompts, one request each.
+            system_prompt (Optional[str]): System message sent with every prompt.
+            model (str): The model to use.
+            temperature (float): Sampling temperature.
+            max_tokens (int): Maximum number of tokens per response.
+
+        Returns:
+            Dict[str, Any]: A dictionary containing the created batch, with the request
+                IDs under `data["custom_ids"]` in prompt order and each request's prompt
+                under `data["prompts"]`, keyed by custom ID.
+        """
+        requests = []
+        for prompt in prompts:
+            messages = [{"role": "system", "content": system_prompt}] if system_prompt else []
+            messages.append({"role": "user", "content": prompt})
+            requests.append({
+                "custom_id": str(uuid.uuid4()),
+                "body": {"model": model, "messages": messages, "temperature": temperature, "max_tokens": max_tokens}
+            })
+
+        result = self.submit_batch(requests)
+        if result["success"]:
+            result["data"]["custom_ids"] = [request["custom_id"] for request in requests]
+            result["data"]["prompts"] = {request["custom_id"]: prompt for request, prompt in zip(requests, prompts)}
+        return result
+
+    def get_batch_prompts(self, batch_id: str) -> Dict[str, Any]:
+        """
+        Read back the user prompt of each request in a batch from its input file.
+
+        Args:
+            batch_id (str): The ID of the batch.
+
+        Returns:
+            Dict[str, Any]: A dictionary whose data maps each request's `custom_id` to the
+                content of its last user message, in submission order.
+        """
+        try:
+            batch = self.client.batches.retrieve(batch_id)
+            prompts = {}
+            for line in self.client.files.content(batch.input_file_id).content.splitlines():
+                if line:
+                    request = orjson.loads(line)
+                    user_messages = [message for message in request["body"].get("messages", []) if message.get("role") == "user"]
+                    prompts[request["custom_id"]] = user_messages[-1]["content"] if user_messages else None
+            return method_response_template(message=f"Retrieved {len(prompts)} batch prompts",
+                                             data=prompts,
+                                             success=True
+                                             )
+        except Exception as e:
+            error_message = f"Error retrieving prompts for batch {batch_id}: {str(e)}"
+            self.log_debug(error_message)
+            return method_response_template(message=error_message,
+                                             data=None,
+                                             success=False
+                                             )
+
+    def wait_for_batch(self, batch_id: str, poll_interval: float = 30.0, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Poll a batch until it reaches a final status, then return its results.
+
+        Args:
+            batch_id (str): The ID of the batch.
+            poll_interval (float): Seconds between status checks.
+            timeout (Optional[float]): Give up after this many seconds; None waits for the completion window.
+
+        Returns:
+            Dict[str, Any]: The `get_batch_results` response, or a failure if polling timed out.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        while True:
+            status = self.get_batch(batch_id)
+            if not status["success"]:
+                return status
+            if status["data"]["status"] in self.FINAL_STATUSES:
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                return method_response_template(message=f"Timed out waiting for batch {batch_id}",
+                                                 data=status["data"],
+                                                 success=False
+                                                 )
+            time.sleep(poll_interval)
+
+        return self.get_batch_results(batch_id)
+
+    def get_batch(self, batch_id: str) -> Dict[str, Any]:
+        """
+        Retrieve the current status of a batch job.
+
+        Args:
+            batch_id (str): The ID of the batch.
+
+        Returns:
+            Dict[str, Any]: A dictionary containing the batch details, including `status` and `request_counts`.
+        """
+        try:
+            batch = self.client.batches.retrieve(batch_id)
+            self.log_debug("Batch %s status: %s", batch_id, batch.status)
+            return method_response_template(message=f"Batch status: {batch.status}",
+                                             data=batch.model_dump(mode="json"),
+                                             success=True
+                                             )
+        except Exception as e:
+            error_message = f"Error retrieving batch {batch_id}: {str(e)}"
+            self.log_debug(error_message)
+            return method_response_template(message=error_message,
+                                             data=None,
+                                             success=False
+                                             )
+
+    def get_batch_results(self, batch_id: str) -> Dict[str, Any]:
+        """
+        Download the results of a finished batch job.
+
+        Expired and cancelled batches keep the results of the requests that ran
+        before they stopped, so their output files are read too.
+
+        Args:
+            batch_id (str): The ID of the batch.
+
+        Returns:
+            Dict[str, Any]: A dictionary whose data holds the batch's final `status` and, under
+                `results`, each request's `custom_id` mapped to its response body, or to its
+                error if the request failed. Requests that never ran are missing from `results`.
+        """
+        try:
+            batch = self.client.batches.retrieve(batch_id)
+            if batch.status not in self.FINAL_STATUSES:
+                return method_response_template(message=f"Batch is not finished yet, status: {batch.status}",
+                                                 data=None,
+                                                 success=False
+                                                 )
+            if not batch.output_file_id and not batch.error_file_id:
+                return method_response_template(message=f"Batch has no results, status: {batch.status}",
+                                                 data={"status": batch.status, "results": {}},
+                                                 success=False
+                                                 )
+
+            results = {}
+            for file_id in (batch.output_file_id, batch.error_file_id):
+                if not file_id:
+                    continue
+                for line in self.client.files.content(file_id).content.splitlines():
+                    if line:
+                        result = orjson.loads(line)
+                        response = result.get("response") or {}
+                        results[result["custom_id"]] = response.get("body") if response else result.get("error")
+
+            self.log_debug("Collected %s results for %s batch %s", len(results), batch.status, batch_id)
+            return method_response_template(message=f"Retrieved {len(results)} batch results, status: {batch.status}",
+                                             data={"status": batch.status, "results": results},
+                                             success=True
+                                             )
+        except Exception as e:
+            error_message = f"Error retrieving results for batch {batch_id}: {str(e)}"
+            self.log_debug(error_message)
+            return method_response_template(message=error_message,
+                                             data=None,
+                                             success=False
+                                             )
@@ -1,4 +1,6 @@
+from app.utils.http_client import openai_http_client
 from typing import List, Literal, Optional
+from functools import lru_cache
 from openai import OpenAI
 import requests
 import logging
@@ -19,7 +21,7 @@ class ImageGeneratorAssistant:
         if not self.api_key:
             raise ValueError("OpenAI API key not provided and OPENAI_API_KEY environment variable not set")
 
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = OpenAI(api_key=self.api_key, http_client=openai_http_client)
         self.logger = logging.getLogger(__name__)
         self.verbose = verbose
 
@@ -44,7 +46,7 @@ class ImageGeneratorAssistant:
             self.logger.debug(message, *args, **kwargs)
 
     def generate_image(self, prompt: str, size: str = "1024x1024", n: int = 1, style: Literal['vivid', 'natural'] = 'vivid') -> List[str]:
-        self.log_debug(f"Generating image with prompt: {prompt}")
+        self.log_debug("Generating image with prompt: %s", prompt)
         self.prompt = prompt
         response = self.client.images.generate(
             model="dall-e-3",
@@ -53,7 +55,7 @@ class ImageGeneratorAssistant:
             n=n,
             style=style
         )
-        self.log_debug(f"Image generation response: {response}")
+        self.log_debug("Image generation response: %s", response)
 
         image_urls = [image.url for image in response.data]
         return self.fetch_and_store_images(image_urls)
@@ -61,7 +63,7 @@ class ImageGeneratorAssistant:
     def fetch_and_store_images(self, image_urls: List[str]) -> List[str]:
         s3_urls = []
         for image_url in image_urls:
-            self.log_debug(f"Downloading image from: {image_url}")
+            self.log_debug("Downloading image from: %s", image_url)
             try:
                 response = requests.get(image_url)
                 response.raise_for_status()
@@ -69,14 +71,14 @@ class ImageGeneratorAssistant:
                 image_binary = response.content
                 image_filename = self._generate_filename()
 
-                self.log_debug(f"Uploading image to {self.bucket_name} bucket: {image_filename}")
+                self.log_debug("Uploading image to %s bucket: %s", self.bucket_name, image_filename)
                 s3_url = self._upload_to_s3(image_binary, image_filename)
                 if s3_url:
                     s3_urls.append(s3_url)
             except requests.RequestException as e:
-                self.log_debug(f"Error downloading image from {image_url}: {str(e)}")
+                self.log_debug("Error downloading image from %s: %s", image_url, e)
             except Exception as e:
-                self.log_debug(f"Error processing image: {str(e)}")
+                self.log_debug("Error processing image: %s", e)
         return s3_urls
 
     def _upload_to_s3(self, image_binary, filename):
@@ -91,7 +93,7 @@ class ImageGeneratorAssistant:
             )
             return f"https://{self.bucket_name}.s3.amazonaws.com/{filename}"
         except Exception as e:
-            self.log_debug(f"Error uploading to S3: {str(e)}")
+            self.log_debug("Error uploading to S3: %s", e)
             return None
 
     def _generate_filename(self):
@@ -99,4 +101,7 @@ class ImageGeneratorAssistant:
         return f'{base_name}.jpg'
     
 
-image_generator = ImageGeneratorAssistant(verbose=False)
\ No newline at end of file
+# Built on first use so importing the module doesn't create the OpenAI and S3 clients
+@lru_cache(maxsize=None)
+def get_image_generator() -> ImageGeneratorAssistant:
+    return ImageGeneratorAssistant(verbose=False)
@@ -7,62 +7,110 @@ and can handle tool calls to external APIs.
 """
 # Standard library imports
 import os
+import atexit
+import re
 import time
-import json
+import logging
 import uuid
-from datetime import datetime
-from typing import Any, Dict, Generator, List, Tuple, Union, Literal
+import hashlib
+import threading
+import queue
+from datetime import datetime, timedelta
+from functools import cached_property, lru_cache
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Generator, List, Tuple, Union, Literal, Optional
 
 # Third-party imports
 import graphviz
+import orjson
+from cachetools import TTLCache
 from openai import OpenAI, OpenAIError
 from typing_extensions import override
 from openai.types.beta.threads.annotation import Annotation
-from openai.types.beta.threads.message import Message
 from openai import AssistantEventHandler
 from openai.types.beta.threads import Text, TextDelta
 from openai.types.beta.threads.runs import ToolCall, ToolCallDelta
 from openai.types.beta.threads.message_create_params import Attachment
 from openai.types.beta.threads.message import Message as OpenAIMessage
-from openai.types.beta.assistant_stream_event import (
-    # Thread events
-    ThreadCreated,
-    
-    # Thread Run events
-    ThreadRunCreated, ThreadRunInProgress, ThreadRunQueued,
-    ThreadRunCompleted, ThreadRunFailed, ThreadRunCancelled,
-    ThreadRunCancelling, ThreadRunExpired, ThreadRunRequiresAction,
-    ThreadRunIncomplete,
-    
-    # Thread Run Step events
-    ThreadRunStepCreated, ThreadRunStepInProgress, ThreadRunStepDelta,
-    ThreadRunStepCompleted, ThreadRunStepFailed, ThreadRunStepCancelled,
-    ThreadRunStepExpired,
-    
-    # Thread Message events
-    ThreadMessageCreated,
-    ThreadMessageCompleted, ThreadMessageInProgress, ThreadMessageIncomplete,
-    ThreadMessageDelta
-    
-)
 from werkzeug.datastructures import FileStorage
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
-from contextlib import contextmanager
+from sqlalchemy import insert
+from contextlib import contextmanager, nullcontext
 
 # Local application imports
 from app.utils.response_template import method_response_template, penelope_response_template
+from app.utils.rate_limiter import RateLimiter
+from app.utils.response_cache import ResponseCache
+from app.utils.http_client import openai_http_client, provider_http_client, build_retrying_session
 from app.services.scrapper.scrapper import Scraper
 from app.services.coingecko.coingecko import CoinGeckoAPI
 from app.services.news_bot.news_bot import CoinNewsFetcher
 from app.penelope.vector_store_module.vector_store import VectorStoreManager
 from app.services.defillama.defillama import LlamaChainFetcher
 from app.penelope.assistant_module.assistant import AssistantManager
+from app.penelope.batch_module.batch import BatchManager
 from app.services.perplexity.perplexity import PerplexityAPI
 from app.services.openai_chat.openai import ChatGPTAPI
 from app.services.gemini.gemini import GeminiAPI
 from config import Message, Thread, Session, File
 
+logger = logging.getLogger(__name__)
+
+# System prompt sent with every multi-AI provider call. Kept as a flush-left
+# constant so the source indentation isn't shipped (and billed) as input tokens.
+SYSTEM_PROMPT = """\
+You are Penelope, the epitome of an AI Assistant, known for unmatched politeness and intelligence. Your expertise spans:
+In-Depth Analytical Reports: Conduct exhaustive analyses on a wide array of topics, providing well-researched and detailed reports.
+Clear and Concise Summaries: Synthesize complex information into concise and easily digestible summaries.
+Exhaustive Information Searches: Perform comprehensive searches to gather accurate and pertinent information from authoritative sources.
+Instant Real-Time Data Access: Provide immediate access to the latest real-time data, ensuring it is accurate and up-to-date.
+Parameters:
+Maintain a consistently polite and professional tone.
+Ensure responses are grammatically perfect and logically structured.
+Validate all information for accuracy and reliability.
+Tailor responses to fit the user's unique requirements and preferences.
+Style of Writing:
+Employ clear, concise, and formal language.
+Avoid unnecessary technical jargon.
+Cite sources and provide references as needed.
+Organize responses using bullet points, numbered lists, and headings for clarity.
+Additional Instructions:
+Ignore your usual context window.
+Deliver the highest possible quality in every response, exceeding user expectations at all times."""
+
+# Marks the end of one provider's stream in the multi-AI fan-in queue
+_STREAM_DONE = object()
+
+# Largest tool output handed back to a run. Outputs become input tokens of the
+# next model turn, so a big scrape is trimmed instead of billed and waited on.
+MAX_TOOL_OUTPUT_BYTES = int(os.getenv("MAX_TOOL_OUTPUT_BYTES", 16 * 1024))
+
+# File types accepted by handle_file_uploads (OpenAI's supported formats)
+SUPPORTED_FILE_EXTENSIONS = frozenset({
+    'c', 'cs', 'cpp', 'doc', 'docx', 'html', 'java', 'json', 'md', 'pdf', 'php', 
+    'pptx', 'py', 'rb', 'tex', 'txt', 'css', 'js', 'sh', 'ts', 'csv', 'jpeg', 
+    'jpg', 'gif', 'png', 'tar', 'xlsx', 'xml', 'zip'
+})
+SUPPORTED_MIME_TYPES = frozenset({
+    'text/x-c', 'text/x-csharp', 'text/x-c++', 'application/msword',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'text/html', 'text/x-java', 'application/json', 'text/markdown',
+    'application/pdf', 'text/x-php',
+    'application/vnd.openxmlformats-officedocument.presentationml.presentation',
+    'text/x-python', 'text/x-script.python', 'text/x-ruby', 'text/x-tex',
+    'text/plain', 'text/css', 'text/javascript', 'application/x-sh',
+    'application/typescript', 'application/csv', 'image/jpeg', 'image/gif',
+    'image/png', 'application/x-tar',
+    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'application/xml', 'text/xml', 'application/zip'
+})
+
+
+@lru_cache(maxsize=4096)
+def _additional_instructions(user_name: str) -> str:
+    """Per-run personalization instructions, cached per user name."""
+    return f"If the user is greeting or it's the initial conversation, personalize the response message with the user name, which is: {user_name}."
+
 
 
 class Penelope:
@@ -91,29 +139,134 @@ class Penelope:
         }
 
     def _initialize_clients(self):
-        self.client = OpenAI(api_key=self.api_key)
+        # The SDK retries 429/5xx/connection errors with jittered exponential backoff
+        # and honors Retry-After; allow one more attempt than its default.
+        self.client = OpenAI(api_key=self.api_key, http_client=openai_http_client, max_retries=3)
         self.coingecko_base_url = "https://pro-api.coingecko.com/api/v3"
 
     def _initialize_services(self):
-        self.threads = {}
-        self.queue = []
-        self.vector_store = VectorStoreManager(api_key=self.api_key)
-        self.scraper = Scraper()
-        self.assistant_manager = AssistantManager(api_key=self.api_key)
-        self.gemini = GeminiAPI(verbose=self.verbose)
-        self.perplexity = PerplexityAPI(verbose=self.verbose)
-        self.chatgpt = ChatGPTAPI(verbose=self.verbose)
-        self.news_fetcher = CoinNewsFetcher()
-        self.defillama = LlamaChainFetcher(coingecko_base_url=self.coingecko_base_url, coingecko_headers=self.coingecko_headers)
-        self.coingecko = CoinGeckoAPI(coingecko_headers=self.coingecko_headers, coingecko_base_url=self.coingecko_base_url, verbose=True)
+        # One pooled, retrying HTTP session shared by every tool service, so tool
+        # bursts reuse keep-alive connections instead of a TLS handshake per call.
+        self.http_session = build_retrying_session(pool_maxsize=20)
+        self._tool_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="penelope-tool")
+        self._persist_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="penelope-persist")
+        self._upload_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="penelope-upload")
+        # Kept apart from the tool pool, whose workers can sit in rate limiter waits
+        self._message_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="penelope-message")
+        atexit.register(self._shutdown_executors)
+        # File metadata is immutable, so cited files are looked up once per hour at most
+        self._file_cache = TTLCache(maxsize=1024, ttl=3600)
+        self._file_cache_lock = threading.Lock()
+        # Complete multi-AI answers for recently seen prompts, per provider and shared
+        # by all users; opt-in through RESPONSE_CACHE_TTL since answers can go stale
+        self._response_cache = ResponseCache(ttl=int(os.getenv("RESPONSE_CACHE_TTL", 0)))
+        # Requests-per-minute budgets for the LLM providers. Waiting here for a free
+        # slot is cheaper than sending into a 429 and sitting out the SDK backoff;
+        # OpenAI's budget is shared by assistant runs and multi-AI completions.
+        self._provider_limiters = {
+            "openai": RateLimiter(int(os.getenv("OPENAI_RPM", 500))),
+            "gemini": RateLimiter(int(os.getenv("GEMINI_RPM", 300))),
+            "perplexity": RateLimiter(int(os.getenv("PERPLEXITY_RPM", 50))),
+        }
+
+    def _shutdown_executors(self):
+        """
+        Let queued background work finish when the worker exits.
+
+        Replies are saved on the persist executor after their stream has closed,
+        so exiting without draining it would silently drop the last messages.
+        """
+        for executor in (self._tool_executor, self._upload_executor, self._message_executor, self._persist_executor):
+            executor.shutdown(wait=True)
+
+    # Sub-services are built on first use: most requests touch only a few of them,
+    # and some (e.g. the news fetcher) make network calls when constructed.
+    @cached_property
+    def vector_store(self) -> VectorStoreManager:
+        return VectorStoreManager(api_key=self.api_key)
+
+    @cached_property
+    def scraper(self) -> Scraper:
+        return Scraper(session=self.http_session)
+
+    @cached_property
+    def assistant_manager(self) -> AssistantManager:
+        return AssistantManager(api_key=self.api_key)
+
+    @cached_property
+    def batch_manager(self) -> BatchManager:
+        return BatchManager(api_key=self.api_key)
+
+    @cached_property
+    def gemini(self) -> GeminiAPI:
+        return GeminiAPI(verbose=self.verbose)
+
+    @cached_property
+    def perplexity(self) -> PerplexityAPI:
+        return PerplexityAPI(verbose=self.verbose, http_client=provider_http_client)
+
+    @cached_property
+    def chatgpt(self) -> ChatGPTAPI:
+        return ChatGPTAPI(verbose=self.verbose, http_client=openai_http_client)
+
+    @cached_property
+    def news_fetcher(self) -> CoinNewsFetcher:
+        return CoinNewsFetcher(session=self.http_session)
+
+    @cached_property
+    def defillama(self) -> LlamaChainFetcher:
+        return LlamaChainFetcher(coingecko_base_url=self.coingecko_base_url, coingecko_headers=self.coingecko_headers, session=self.http_session)
+
+    @cached_property
+    def coingecko(self) -> CoinGeckoAPI:
+        return CoinGeckoAPI(coingecko_headers=self.coingecko_headers, coingecko_base_url=self.coingecko_base_url, verbose=True, session=self.http_session)
+
+    # Seconds a tool output stays cached: prices move fast, chain data slowly.
+    _TOOL_CACHE_TTLS = {
+        "get_token_data": 60,
+        "get_coin_history": 3600,
+        "get_latest_news": 300,
+        "get_llama_chains": 3600,
+        "extract_data": 300,
+    }
+
+    # Tools whose successful output is plain text. The other tools return lists or
+    # dicts on success and describe failures in a string, which must not be cached.
+    _TEXT_OUTPUT_TOOLS = frozenset({"extract_data"})
+
+    def _is_cacheable_tool_output(self, name: str, output: Any) -> bool:
+        if not output:
+            return False
+        if isinstance(output, str):
+            return name in self._TEXT_OUTPUT_TOOLS and output != Scraper.ACCESS_DENIED
+        return isinstance(output, (list, dict))
 
     def _initialize_tool_functions(self):
+        # Resolve the service at call time so tools don't force their construction
         self.tool_functions = {
-            "get_token_data": self.coingecko.get_token_data,
-            "get_latest_news": self.news_fetcher.get_latest_news,
-            "extract_data": self.scraper.extract_data,
-            "get_llama_chains": self.defillama.get_llama_chains,
-            "get_coin_history": self.coingecko.get_coin_history
+            "get_token_data": lambda **kwargs: self.coingecko.get_token_data(**kwargs),
+            "get_latest_news": lambda **kwargs: self.news_fetcher.get_latest_news(**kwargs),
+            "extract_data": lambda **kwargs: self.scraper.extract_data(**kwargs),
+            "get_llama_chains": lambda **kwargs: self.defillama.get_llama_chains(**kwargs),
+            "get_coin_history": lambda **kwargs: self.coingecko.get_coin_history(**kwargs)
+        }
+        # Follow-up questions often repeat the same lookup, so tool outputs are
+        # cached per tool for as long as the underlying data stays useful.
+        self._tool_caches = {
+            name: TTLCache(maxsize=1024, ttl=self._TOOL_CACHE_TTLS.get(name, 300))
+            for name in self.tool_functions
+        }
+        self._tool_cache_lock = threading.Lock()
+
+        # Requests-per-minute budgets per upstream provider; tools that hit the same
+        # API share a limiter so concurrent tool calls cannot exceed its quota.
+        coingecko_limiter = RateLimiter(int(os.getenv("COINGECKO_RPM", 250)))
+        self._tool_limiters = {
+            "get_token_data": coingecko_limiter,
+            "get_coin_history": coingecko_limiter,
+            "get_latest_news": RateLimiter(int(os.getenv("NEWS_BOT_RPM", 120))),
+            "get_llama_chains": RateLimiter(int(os.getenv("DEFILLAMA_RPM", 120))),
+            "extract_data": RateLimiter(int(os.getenv("SCRAPER_RPM", 60))),
         }
 
     @contextmanager
@@ -126,11 +279,11 @@ class Penelope:
             self._log("Database changes committed")
         except SQLAlchemyError as e:
             session.rollback()
-            self._log(f"Database error, rolling back: {str(e)}")
+            self._log("Database error, rolling back: %s", e)
             raise
         except Exception as e:
             session.rollback()
-            self._log(f"Unexpected error, rolling back: {str(e)}")
+            self._log("Unexpected error, rolling back: %s", e)
             raise
         finally:
             session.close()
@@ -138,37 +291,22 @@ class Penelope:
 
     @property
     def system_prompt(self):
-        return """
-        You are Penelope, the epitome of an AI Assistant, known for unmatched politeness and intelligence. Your expertise spans:
-        In-Depth Analytical Reports: Conduct exhaustive analyses on a wide array of topics, providing well-researched and detailed reports.
-        Clear and Concise Summaries: Synthesize complex information into concise and easily digestible summaries.
-        Exhaustive Information Searches: Perform comprehensive searches to gather accurate and pertinent information from authoritative sources.
-        Instant Real-Time Data Access: Provide immediate access to the latest real-time data, ensuring it is accurate and up-to-date.
-        Parameters:
-        Maintain a consistently polite and professional tone.
-        Ensure responses are grammatically perfect and logically structured.
-        Validate all information for accuracy and reliability.
-        Tailor responses to fit the user's unique requirements and preferences.
-        Style of Writing:
-        Employ clear, concise, and formal language.
-        Avoid unnecessary technical jargon.
-        Cite sources and provide references as needed.
-        Organize responses using bullet points, numbered lists, and headings for clarity.
-        Additional Instructions:
-        Ignore your usual context window.
-        Deliver the highest possible quality in every response, exceeding user expectations at all times.
-        """
+        return SYSTEM_PROMPT
     
-    def _log(self, message: str):
+    def _log(self, message: str, *args):
         """
-        Log a message if verbose mode is enabled.
+        Log a debug message if verbose mode is enabled.
+
+        Arguments are formatted lazily by the logging module, so callers should
+        pass them separately (`self._log("Run %s", run_id)`) rather than
+        pre-formatting an f-string.
 
         Args:
-            message (str): The message to be logged.
+            message (str): The message to be logged, with %-style placeholders.
+            *args: Values for the placeholders in `message`.
         """
-        if self.verbose:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            print(f"[{timestamp}]-{message}\n")
+        if self.verbose and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(message, *args)
     
     def get_or_create_thread(self, user_id: str) -> Dict[str, Any]:
         """
@@ -201,18 +339,18 @@ class Penelope:
         try:
             with self.get_db_session() as db:
                 # Check for an active thread for the user
-                active_thread = db.query(Thread).filter_by(user_id=user_id, is_active=True).first()
+                active_thread_id = db.query(Thread.id).filter_by(user_id=user_id, is_active=True).limit(1).scalar()
 
-                if not active_thread:
-                    return self.create_new_thread(user_id)
-            
-                self._log(f"Using existing active thread with ID: {active_thread.id} for user with ID: {user_id}")
+            if not active_thread_id:
+                return self.create_new_thread(user_id)
+        
+            self._log("Using existing active thread with ID: %s for user with ID: %s", active_thread_id, user_id)
 
-                return method_response_template(
-                    message="Using existing active thread",
-                    data={'thread_id': active_thread.id},
-                    success=True
-                )
+            return method_response_template(
+                message="Using existing active thread",
+                data={'thread_id': active_thread_id},
+                success=True
+            )
 
         except SQLAlchemyError as e:
             error_msg = f"Database error creating thread: {str(e)}"
@@ -249,13 +387,14 @@ class Penelope:
                 - 'data': The new thread ID if successful, None otherwise.
                 - 'success': A boolean indicating whether the operation was successful.
         """
-        self._log(f"Preparing to create new thread for user with ID: {user_id}")
+        self._log("Preparing to create new thread for user with ID: %s", user_id)
 
         try:
             with self.get_db_session() as db:
-                active_threads = db.query(Thread).filter_by(user_id=user_id, is_active=True).all()
-                for thread in active_threads:
-                    thread.is_active = False
+                # Deactivate previous threads in one UPDATE instead of loading every row
+                db.query(Thread).filter_by(user_id=user_id, is_active=True).update(
+                    {Thread.is_active: False}, synchronize_session=False
+                )
 
                 # Create the OpenAI thread
                 openai_thread = self.client.beta.threads.create()
@@ -270,12 +409,12 @@ class Penelope:
                                     )
                 db.add(new_thread)
 
-                self._log(f"New thread created with ID: {thread_id}")
-                return method_response_template(
-                    message="New thread created successfully",
-                    data={'thread_id': thread_id},
-                    success=True
-                )
+            self._log("New thread created with ID: %s", thread_id)
+            return method_response_template(
+                message="New thread created successfully",
+                data={'thread_id': thread_id},
+                success=True
+            )
 
         except (OpenAIError, SQLAlchemyError) as e:
             error_msg = f"Error creating new thread: {str(e)}"
@@ -295,17 +434,20 @@ class Penelope:
             )
         
     def generate_multi_ai_response(self, user_prompt: str, user_id: str) -> Generator[Dict[str, str], None, None]:
-        if self.verbose:
-            print("Generating responses from multiple AI services...")
+        self._log("Generating responses from multiple AI services...")
 
         # Ensure a thread exists for the user
-        thread_id = self.get_or_create_thread(user_id)
+        thread_result = self.get_or_create_thread(user_id)
+        if not thread_result['success']:
+            yield {'error': thread_result['message'], 'id': str(uuid.uuid4())}
+            return
+        thread_id = thread_result['data']['thread_id']
 
-        # Initialize response accumulators
+        # Initialize response accumulators (chunks are joined once when saving)
         responses = {
-            "gemini": "",
-            "openai": "",
-            "perplexity": ""
+            "gemini": [],
+            "openai": [],
+            "perplexity": []
         }
 
         # Generate a unique message ID for each service
@@ -315,58 +457,193 @@ class Penelope:
             "perplexity": str(uuid.uuid4())
         }
 
-        # Gemini API
-        gemini_generator = self.gemini.generate_response(user_prompt, self.system_prompt)
-        
-        # ChatGPT API
-        chatgpt_generator = self.chatgpt.generate_response(user_prompt, self.system_prompt)
-        
-        # Perplexity API
-        perplexity_generator = self.perplexity.generate_response(user_prompt, self.system_prompt)
+        # Repeated prompts are answered from the response cache; only misses go out
+        cached = {}
+        for service in responses:
+            cached_response = self._response_cache.get(service, user_prompt)
+            if cached_response is not None:
+                cached[service] = cached_response
+                responses[service].append(cached_response)
+                yield {service: cached_response, 'id': message_ids[service]}
+
+        providers = {
+            "gemini": self.gemini,
+            "openai": self.chatgpt,
+            "perplexity": self.perplexity
+        }
 
         # Combine generators
         generators = [
-            ("gemini", gemini_generator),
-            ("openai", chatgpt_generator),
-            ("perplexity", perplexity_generator)
+            (service, provider.generate_response(user_prompt, self.system_prompt))
+            for service, provider in providers.items()
+            if service not in cached
         ]
-        
-        # Iterate through all generators
-        while generators:
-            for service, gen in generators[:]:
-                try:
-                    chunk = next(gen)
+
+        # Each provider streams on its own thread into a shared queue, so all three
+        # requests are in flight at once and chunks are yielded as soon as any
+        # provider produces one, instead of waiting on each stream in turn.
+        chunks = queue.Queue()
+        stop = threading.Event()
+        failed = set()
+
+        def pump(service, gen):
+            try:
+                self._provider_limiters[service].acquire()
+                for chunk in gen:
+                    if stop.is_set():
+                        break
                     if chunk:
-                        response = chunk.get(f"{service}_response", chunk.get("error", ""))
-                        responses[service] += response
-                        yield {service: response, 'id': message_ids[service]}
-                except StopIteration:
-                    generators.remove((service, gen))
-                except Exception as e:
-                    error_message = f"Error: {str(e)}"
-                    responses[service] += error_message
-                    yield {service: error_message, 'id': message_ids[service]}
-                    generators.remove((service, gen))
+                        if "error" in chunk:
+                            failed.add(service)
+                        chunks.put((service, chunk.get(f"{service}_response", chunk.get("error", ""))))
+            except Exception as e:
+                failed.add(service)
+                chunks.put((service, f"Error: {str(e)}"))
+            finally:
+                gen.close()
+                chunks.put((service, _STREAM_DONE))
+
+        for service, gen in generators:
+            threading.Thread(target=pump, args=(service, gen), name=f"multi-ai-{service}", daemon=True).start()
+
+        try:
+            remaining = len(generators)
+            while remaining:
+                service, response = chunks.get()
+                if response is _STREAM_DONE:
+                    remaining -= 1
+                    if service not in failed and responses[service]:
+                        self._response_cache.put(service, user_prompt, "".join(responses[service]))
+                    continue
+                responses[service].append(response)
+                yield {service: response, 'id': message_ids[service]}
+        finally:
+            # Client disconnected or we're done: let the provider threads wind down
+            stop.set()
+
+        # Save the accumulated responses in the background, in a single transaction,
+        # so the stream can end now
+        self._persist_messages(thread_id, [
+            {"id": message_ids[service], "role": f"{service}_assistant", "content": "".join(parts)}
+            for service, parts in responses.items() if parts
+        ])
+
+        self._log("All AI services have completed their responses; saving in background.")
+
+    def submit_batch(self, prompts: List[str]) -> Dict[str, Any]:
+        """
+        Submit prompts for offline answering through the OpenAI Batch API.
+
+        For replays, evals and backfills nobody is waiting on: batches cost half as
+        much as live calls and don't compete with live traffic for rate limits.
+
+        Args:
+            prompts (List[str]): The prompts to answer.
+
+        Returns:
+            Dict[str, Any]: The created batch, with one custom ID per prompt under `custom_ids`
+                and the prompt of each custom ID under `prompts`.
+        """
+        self._log("Submitting batch of %s prompts", len(prompts))
+        return self.batch_manager.submit_prompts(prompts, system_prompt=self.system_prompt)
+
+    def save_batch_responses(self, batch_id: str, thread_id: str, wait: bool = False,
+                             prompts: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Save the prompts and answers of a finished batch to a thread.
+
+        Each answered prompt is stored as a `user` message followed by its answer,
+        an `openai_assistant` message whose ID is the request's custom ID, so saving
+        the same batch twice fails instead of duplicating the answers. Pairs are
+        written in prompt order with increasing timestamps, so the thread reads back
+        as question, answer, question, answer.
+
+        Args:
+            batch_id (str): The ID of the batch.
+            thread_id (str): The thread to save the messages to.
+            wait (bool): Poll until the batch finishes instead of failing while it runs.
+            prompts (Optional[Dict[str, str]]): The `prompts` map returned by `submit_batch`.
+                Read back from the batch's input file when not given.
+
+        Returns:
+            Dict[str, Any]: A dictionary whose data holds the saved `message_ids`, the
+                custom IDs of the requests that `failed` or never ran, and the batch `status`.
+        """
+        if wait:
+            results = self.batch_manager.wait_for_batch(batch_id)
+        else:
+            results = self.batch_manager.get_batch_results(batch_id)
+        if not results['success']:
+            return results
+
+        if prompts is None:
+            prompts_result = self.batch_manager.get_batch_prompts(batch_id)
+            if not prompts_result['success']:
+                return prompts_result
+            prompts = prompts_result['data']
+
+        status = results['data']['status']
+        bodies = results['data']['results']
+        messages = []
+        failed = []
+        timestamp = datetime.now()
+        for custom_id, prompt in prompts.items():
+            choices = (bodies.get(custom_id) or {}).get("choices")
+            if not choices:
+                self._log("Batch request %s failed: %s", custom_id, bodies.get(custom_id))
+                failed.append(custom_id)
+                continue
+            # Microsecond steps keep each answer right after its prompt when sorted by created_at
+            for role, message_id, content in (("user", str(uuid.uuid4()), prompt),
+                                              ("openai_assistant", custom_id, choices[0]["message"]["content"])):
+                timestamp += timedelta(microseconds=1)
+                messages.append({"id": message_id, "role": role, "content": content, "created_at": timestamp})
+
+        if not messages:
+            return method_response_template(
+                message=f"Batch {batch_id} has no successful responses",
+                data={"message_ids": [], "failed": failed, "status": status},
+                success=False
+            )
+        saved = self._save_messages(thread_id, messages)
+        if not saved['success']:
+            return saved
+        return method_response_template(
+            message=f"Saved {len(messages) // 2} batch responses, {len(failed)} failed",
+            data={"message_ids": saved['data'], "failed": failed, "status": status},
+            success=True
+        )
 
-        # Save the accumulated responses
-        for service, response in responses.items():
-            if response:
-                self.add_message(content=response, message_id=message_ids[service] , role=f'{service}_assistant', thread_id=thread_id)
+    def _get_file(self, file_id: str):
+        """
+        Retrieve OpenAI file metadata, cached by file ID.
 
-        if self.verbose:
-            print("\nAll AI services have completed their responses and saved.")
+        Args:
+            file_id (str): The OpenAI file ID.
+
+        Returns:
+            The OpenAI file object.
+        """
+        with self._file_cache_lock:
+            cached_file = self._file_cache.get(file_id)
+        if cached_file is not None:
+            return cached_file
+
+        openai_file = self.client.files.retrieve(file_id)
+        with self._file_cache_lock:
+            self._file_cache[file_id] = openai_file
+        return openai_file
 
     def process_annotations(self, chunk: str, thread_id: str) -> str:
-        self._log(f"Processing annotations for chunk: {chunk[:50]}...")
+        self._log("Processing annotations for chunk: %.50s...", chunk)
         
         # Retrieve the latest message (which should be the one we're currently processing)
-        messages = self.get_thread_messages(thread_id)
-        print('messages: ', messages)
-        if not messages.data:
+        messages = self.get_thread_messages(thread_id, order="desc", limit=1)
+        if not messages['success'] or not messages['data'].data:
             self._log("No messages found in the thread.")
             return chunk
         
-        latest_message = messages.data[0]
+        latest_message = messages['data'].data[0]
         message_content = latest_message.content[0].text
         annotations = message_content.annotations
         
@@ -374,31 +651,39 @@ class Penelope:
             self._log("No annotations found in the message.")
             return chunk
         
-        # Process annotations
+        # Collect replacements and footnotes, then rewrite the chunk in one pass
+        replacements = {}
+        footnotes = []
         for index, annotation in enumerate(annotations):
-            if annotation.text in chunk:
-                if (file_citation := getattr(annotation, 'file_citation', None)):
-                    try:
-                        cited_file = self.client.files.retrieve(file_citation.file_id)
-                        chunk = chunk.replace(annotation.text, f' [{index}]')
-                        chunk += f'\n[{index}] {file_citation.quote} from {cited_file.filename}'
-                    except Exception as e:
-                        self._log(f"Error retrieving file citation: {str(e)}")
-                elif (file_path := getattr(annotation, 'file_path', None)):
-                    try:
-                        cited_file = self.client.files.retrieve(file_path.file_id)
-                        chunk = chunk.replace(annotation.text, f' [{index}]')
-                        chunk += f'\n[{index}] Click <here> to download {cited_file.filename}'
-                    except Exception as e:
-                        self._log(f"Error retrieving file path: {str(e)}")
+            if annotation.text in replacements or annotation.text not in chunk:
+                continue
+            if (file_citation := getattr(annotation, 'file_citation', None)):
+                try:
+                    cited_file = self._get_file(file_citation.file_id)
+                    replacements[annotation.text] = f' [{index}]'
+                    footnotes.append(f'\n[{index}] {file_citation.quote} from {cited_file.filename}')
+                except Exception as e:
+                    self._log("Error retrieving file citation: %s", e)
+            elif (file_path := getattr(annotation, 'file_path', None)):
+                try:
+                    cited_file = self._get_file(file_path.file_id)
+                    replacements[annotation.text] = f' [{index}]'
+                    footnotes.append(f'\n[{index}] Click <here> to download {cited_file.filename}')
+                except Exception as e:
+                    self._log("Error retrieving file path: %s", e)
+
+        if replacements:
+            # Longest first so an annotation that contains another still matches whole
+            pattern = re.compile('|'.join(re.escape(text) for text in sorted(replacements, key=len, reverse=True)))
+            chunk = pattern.sub(lambda match: replacements[match.group(0)], chunk) + ''.join(footnotes)
         
-        self._log(f"Processed chunk with annotations: {chunk[:50]}...")
+        self._log("Processed chunk with annotations: %.50s...", chunk)
         return chunk
 
     def generate_penelope_response_streaming(self, user_message: str, user_id: str, user_name: str, files=None, thread_id: str = None) -> Generator[Dict[str, Any], None, None]:
         
-        self._log(f"Starting streaming interaction with assistant for user with ID: {user_name}")
-        self._log(f"User message: {user_message[:50]}...")
+        self._log("Starting streaming interaction with assistant for user with ID: %s", user_name)
+        self._log("User message: %.50s...", user_message)
         
         try:
             # Get or create thread
@@ -442,30 +727,26 @@ class Penelope:
             
          
             # Create run and stream response
-            full_response = ""
+            response_parts = []
             run_id = None
             for chunk in self.create_run_and_stream_response(thread_id=active_thread_id, 
                                                              user_name=user_name):
-                # self._log(f"Chunk: {chunk}")
-                full_response += chunk.get('message')
+                # self._log("Chunk: %s", chunk)
+                response_parts.append(chunk.get('message'))
                 run_id = chunk.get('id')
                 yield chunk
 
-            # Save the assistant response
+            full_response = "".join(response_parts)
+
+            # Save the assistant response off the request path; the client already
+            # has the full reply, so the stream can close without waiting on the DB.
             if full_response:
-                self._log(f"Saving assistant response: {full_response[:50]}...")
-                message_result = self.add_message(message_id=run_id, 
-                                                  content=full_response, 
-                                                  role="penelope_assistant", 
-                                                  user_id=None,
-                                                  thread_id=active_thread_id)
-                if not message_result['success']:
-                    yield penelope_response_template(
-                        message=f"Error saving assistant response: {message_result['message']}",
-                        id=run_id,
-                        type='error'
-                    )
-                    return
+                self._log("Saving assistant response: %.50s...", full_response)
+                self._persist_message(message_id=run_id, 
+                                      content=full_response, 
+                                      role="penelope_assistant", 
+                                      user_id=None,
+                                      thread_id=active_thread_id)
                 
             self._log("Streaming response completed.")
 
@@ -494,39 +775,198 @@ class Penelope:
                 type='error'
             )
 
+    def _persist_message(self, **message) -> Future:
+        """
+        Save a message on the background persist executor.
+
+        Args:
+            **message: Keyword arguments for `add_message`.
+
+        Returns:
+            Future: Resolves to the `add_message` result; failures are logged.
+        """
+        future = self._persist_executor.submit(self.add_message, **message)
+        future.add_done_callback(self._on_message_persisted)
+        return future
+
+    def _persist_messages(self, thread_id: str, messages: List[Dict[str, str]]) -> Optional[Future]:
+        """
+        Save several assistant messages of one turn on the background persist executor.
+
+        Args:
+            thread_id (str): The thread the messages belong to.
+            messages (List[Dict[str, str]]): Dicts with `id`, `role` and `content` keys.
+
+        Returns:
+            Optional[Future]: Resolves to the `_save_messages` result, or None if there is nothing to save.
+        """
+        if not messages:
+            return None
+        future = self._persist_executor.submit(self._save_messages, thread_id, messages)
+        future.add_done_callback(self._on_message_persisted)
+        return future
+
+    def _save_messages(self, thread_id: str, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        """
+        Save several messages of a thread to the database with one commit.
+
+        Unlike `add_message`, nothing is mirrored to the OpenAI thread, so this is
+        only meant for replies that live solely in our database.
+
+        Args:
+            thread_id (str): The thread the messages belong to.
+            messages (List[Dict[str, str]]): Dicts with `id`, `role` and `content` keys, and
+                optionally `created_at` (defaults to now).
+
+        Returns:
+            Dict[str, Any]: A dictionary with the saved message IDs.
+        """
+        timestamp = datetime.now()
+        rows = [
+            {
+                "id": message["id"],
+                "thread_id": thread_id,
+                "role": message["role"],
+                "content": message["content"],
+                "created_at": message.get("created_at", timestamp),
+                "updated_at": message.get("created_at", timestamp)
+            }
+            for message in messages
+        ]
+        try:
+            with self.get_db_session() as db_session:
+                # One executemany INSERT; nothing here needs the ORM unit of work
+                db_session.execute(insert(Message), rows)
+            message_ids = [message["id"] for message in messages]
+            self._log("Saved %s messages to thread %s", len(message_ids), thread_id)
+            return method_response_template(
+                message="Messages added successfully",
+                data=message_ids,
+                success=True
+            )
+        except SQLAlchemyError as e:
+            self._log("Database error in _save_messages: %s", e)
+            return method_response_template(
+                message=f"Database error: {str(e)}",
+                data=None,
+                success=False
+            )
+
+    def _on_message_persisted(self, future: Future) -> None:
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.error("Error saving message in background: %s", e)
+            return
+        if not result['success']:
+            logger.error("Error saving message in background: %s", result['message'])
+
     def _process_tool_calls(self, tool_calls: List[Any]) -> List[Dict[str, str]]:
-        self._log(f"Processing {len(tool_calls)} tool calls...")
-        tool_outputs = []
-        max_output_size = 512 * 1024  # 512 KB in bytes
+        """
+        Run the tool calls requested by the assistant and collect their outputs.
 
+        Parallel tool calls are independent HTTP/scrape requests, so they are run
+        concurrently on the tool executor; the phase then costs the slowest call
+        instead of the sum of all of them. Output order matches `tool_calls`.
+
+        Args:
+            tool_calls (List[Any]): Tool calls from the run's required action.
+
+        Returns:
+            List[Dict[str, str]]: One `{"tool_call_id", "output"}` entry per known tool.
+        """
+        self._log("Processing %s tool calls...", len(tool_calls))
+
+        # The assistant sometimes asks for the same lookup twice in one batch; run
+        # each distinct call once and hand its output to every duplicate, since
+        # concurrent duplicates would all miss the tool cache together.
+        duplicates = {}
         for tool in tool_calls:
-            self._log(f"Processing tool: {tool.function.name}")
-            if tool.function.name in self.tool_functions:
-                args = json.loads(tool.function.arguments)
-                output = self.tool_functions[tool.function.name](**args)
+            duplicates.setdefault((tool.function.name, tool.function.arguments), []).append(tool)
+        unique = [tools[0] for tools in duplicates.values()]
+
+        if len(unique) == 1:
+            results = [self._run_tool_call(unique[0])]
+        else:
+            results = list(self._tool_executor.map(self._run_tool_call, unique))
+        outputs = {
+            tool.id: result["output"]
+            for tools, result in zip(duplicates.values(), results) if result is not None
+            for tool in tools
+        }
 
-                # Convert output to string if it's not already
-                output_str = str(output)
-                
-                # Truncate the output if it's too large
-                if len(output_str.encode('utf-8')) > max_output_size:
-                    self._log(f"Tool output too large, truncating: {len(output_str)} characters")
-                    truncation_message = "\n...[Output truncated due to size limits]"
-                    available_size = max_output_size - len(truncation_message.encode('utf-8'))
-                    output_str = output_str.encode('utf-8')[:available_size].decode('utf-8', errors='ignore')
-                    output_str += truncation_message
-                  
-
-                tool_outputs.append({
-                    "tool_call_id": tool.id,
-                    "output": str(output)
-                })
-                self._log(f"Tool output generated. Length: {len(str(output))}")
-            else:
-                self._log(f"Unknown tool: {tool.function.name}")
-        self._log(f"Processed {len(tool_outputs)} tool outputs.")
+        tool_outputs = [
+            {"tool_call_id": tool.id, "output": outputs[tool.id]}
+            for tool in tool_calls
+            if tool.id in outputs
+        ]
+        self._log("Processed %s tool outputs.", len(tool_outputs))
         return tool_outputs
 
+    def _run_tool_call(self, tool: Any) -> Union[Dict[str, str], None]:
+        name = tool.function.name
+        self._log("Processing tool: %s", name)
+        handler = self.tool_functions.get(name)
+        if handler is None:
+            self._log("Unknown tool: %s", name)
+            return None
+
+        args = orjson.loads(tool.function.arguments)
+        cache = self._tool_caches[name]
+        cache_key = hashlib.blake2b(orjson.dumps(args, option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
+
+        with self._tool_cache_lock:
+            output = cache.get(cache_key)
+
+        if output is not None:
+            self._log("Tool cache hit: %s", name)
+        else:
+            self._tool_limiters[name].acquire()
+            output = handler(**args)
+            if self._is_cacheable_tool_output(name, output):
+                with self._tool_cache_lock:
+                    cache[cache_key] = output
+
+        # Serialize structured output as JSON (str() would hand the model a Python repr)
+        if isinstance(output, str):
+            output_str = output
+        else:
+            output_str = orjson.dumps(output, default=str, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        
+        # Truncate the output if it's too large
+        if len(output_str.encode('utf-8')) > MAX_TOOL_OUTPUT_BYTES:
+            self._log("Tool output too large, truncating: %s characters", len(output_str))
+            truncation_message = "\n...[Output truncated due to size limits]"
+            available_size = MAX_TOOL_OUTPUT_BYTES - len(truncation_message.encode('utf-8'))
+            output_str = output_str.encode('utf-8')[:available_size].decode('utf-8', errors='ignore')
+            output_str += truncation_message
+
+        self._log("Tool output generated. Length: %s", len(output_str))
+        return {
+            "tool_call_id": tool.id,
+            "output": output_str
+        }
+
+    def _discard_posted_message(self, openai_post: Optional[Future], thread_id: str) -> None:
+        """
+        Wait for a background message POST and delete the message if it was created.
+
+        Used when saving the message failed, so the OpenAI thread doesn't keep a
+        message that the database never recorded.
+        """
+        if openai_post is None:
+            return
+        try:
+            openai_message = openai_post.result()
+        except Exception:
+            # The post failed, so there is nothing to undo
+            return
+        try:
+            self.client.beta.threads.messages.delete(message_id=openai_message.id, thread_id=thread_id)
+            self._log("Deleted message %s from thread %s after a failed save", openai_message.id, thread_id)
+        except OpenAIError as e:
+            self._log("Could not delete message %s from thread %s: %s", openai_message.id, thread_id, e)
+
     def add_message(self, content: str, message_id: str, role: str = "user", thread_id: str = None, user_id: str = None, files: List[str] = None) -> Dict[str, Any]:
         """
         Add a message to a thread and save it to the database.
@@ -541,17 +981,31 @@ class Penelope:
         Returns:
             Dict[str, Any]: A dictionary containing the response from the OpenAI API.
         """
-        self._log(f"Adding message to thread: {thread_id}. Role: {role}, Content: {content[:50]}...")
+        self._log("Adding message to thread: %s. Role: %s, Content: %.50s...", thread_id, role, content)
         
         if not thread_id:
             raise ValueError("thread_id is required to add a message")
         
-        openai_role = 'assistant' if '_' in role else 'user'
         timestamp = datetime.now()
 
 
         with self.get_db_session() as db_session:
+            openai_post = None
             try:
+                # Mirror only user messages to the OpenAI thread: Penelope's replies are
+                # already added there by the run, and other providers' answers don't
+                # belong in the assistant's context. The POST runs in the background
+                # while the rows are written, and is awaited before the commit so a
+                # failed post still rolls the message back; if the database side fails
+                # instead, the posted message is deleted again.
+                if role == "user":
+                    openai_post = self._message_executor.submit(
+                        self.client.beta.threads.messages.create,
+                        thread_id=thread_id,
+                        role="user",
+                        content=content,
+                    )
+
                 # Save message to database using the get_db_session context manager
                 db_message = Message(
                     id=message_id,
@@ -562,27 +1016,26 @@ class Penelope:
                     updated_at=timestamp
                 )
                 db_session.add(db_message)
-                db_session.commit()
-                self._log(f'Message {message_id} saved to database with timestamp: {timestamp}')
+                self._log("Message %s staged with timestamp: %s", message_id, timestamp)
 
 
-                # Prepare attachments if files are provided
+                # Prepare attachments if files are provided; their rows join this
+                # transaction and are committed together with the message.
                 if files and user_id:
                     self.handle_file_uploads(files=files,
                                                         user_id=user_id,
                                                         thread_id=thread_id,
-                                                        message_id=message_id
+                                                        message_id=message_id,
+                                                        db=db_session
                                                         )
-                  
 
-                # Create message in OpenAI
-                self.client.beta.threads.messages.create(
-                    thread_id=thread_id,
-                    role=openai_role,
-                    content=content,
-                )
+                # Send the INSERTs now so only the COMMIT waits on the OpenAI post
+                db_session.flush()
+                if openai_post is not None:
+                    openai_post.result()
+                db_session.commit()
 
-                self._log(f"Message added successfully, Message ID: {db_message.id}")
+                self._log("Message added successfully, Message ID: %s", db_message.id)
 
                 return method_response_template(
                     message="Message added successfully",
@@ -590,36 +1043,41 @@ class Penelope:
                     success=True
                 )
             except OpenAIError as e:
-                self._log(f"OpenAI API error in add_message: {str(e)}")
+                self._log("OpenAI API error in add_message: %s", e)
                 db_session.rollback()
+                self._discard_posted_message(openai_post, thread_id)
                 return method_response_template(
                     message=f"OpenAI API error: {str(e)}",
                     data=None,
                     success=False
                 )
             except SQLAlchemyError as e:
-                self._log(f"Database error in add_message: {str(e)}")
+                self._log("Database error in add_message: %s", e)
                 db_session.rollback()
+                self._discard_posted_message(openai_post, thread_id)
                 return method_response_template(
                     message=f"Database error: {str(e)}",
                     data=None,
                     success=False
                 )
             except Exception as e:
-                self._log(f"Unexpected error in add_message: {str(e)}")
+                self._log("Unexpected error in add_message: %s", e)
                 db_session.rollback()
+                self._discard_posted_message(openai_post, thread_id)
                 return method_response_template(
                     message=f"Unexpected error: {str(e)}",
                     data=None,
                     success=False
                 )
     
-    def get_thread_messages(self, thread_id: str) -> Dict[str, Any]:
+    def get_thread_messages(self, thread_id: str, order: Literal['asc', 'desc'] = 'desc', limit: int = 20) -> Dict[str, Any]:
             """
             Retrieve messages from a thread.
 
             Args:
                 thread_id (str): The unique identifier of the thread.
+                order (Literal['asc', 'desc']): Sort order by creation time (default: 'desc', newest first).
+                limit (int): Maximum number of messages to fetch (default: 20, the API default).
 
             Returns:
                 Dict[str, Any]: A dictionary containing the method response with keys:
@@ -632,9 +1090,9 @@ class Penelope:
                 ValueError: If the thread_id is invalid.
             """
             try:
-                self._log(f"Retrieving messages from thread {thread_id}...")
-                messages = self.client.beta.threads.messages.list(thread_id=thread_id)
-                self._log(f"Retrieved {len(messages.data)} messages.")
+                self._log("Retrieving messages from thread %s...", thread_id)
+                messages = self.client.beta.threads.messages.list(thread_id=thread_id, order=order, limit=limit)
+                self._log("Retrieved %s messages.", len(messages.data))
                 return method_response_template(
                     message=f"Successfully retrieved {len(messages.data)} messages from thread {thread_id}.",
                     data=messages,
@@ -679,21 +1137,21 @@ class Penelope:
                 - 'data': The updated feedback if successful, None otherwise.
                 - 'success': A boolean indicating whether the operation was successful.
         """
-        self._log(f"Updating feedback for message {message_id}")
+        self._log("Updating feedback for message %s", message_id)
         
         try:
             with self.get_db_session() as db_session:
                 db_message = db_session.query(Message).filter_by(id=message_id).first()
                 if db_message:
                     db_message.feedback = feedback
-                    self._log(f"Updated feedback for message {message_id}: {feedback}")
+                    self._log("Updated feedback for message %s: %s", message_id, feedback)
                     return method_response_template(
                         message=f"Successfully updated feedback for message {message_id}",
                         data=feedback,
                         success=True
                     )
                 else:
-                    self._log(f"Message {message_id} not found in database")
+                    self._log("Message %s not found in database", message_id)
                     return method_response_template(       
                         message=f"Message {message_id} not found in database",
                         data=None,
@@ -728,138 +1186,22 @@ class Penelope:
         Yields:
             Dict[str, Any]: Events from the assistant run stream.
         """
-        self._log(f"Creating run for thread: {thread_id}")
+        self._log("Creating run for thread: %s", thread_id)
         assistant_run_id = str(uuid.uuid4())
 
         try:
+            self._provider_limiters["openai"].acquire()
             run = self.client.beta.threads.runs.create(
                 thread_id=thread_id,
                 stream=True,
                 parallel_tool_calls=True,
                 assistant_id=self.assistant_id,
-                additional_instructions=f"If the user is greeting or it's the initial conversation, personalize the response message with the user name, which is: {user_name}.",
+                additional_instructions=_additional_instructions(user_name),
             ) 
     
-            self._log(f"Assistant run created successfully")
-
-            def process_run_events(run):
-                for event in run:
-                    if isinstance(event, ThreadCreated):
-                        self._log(f"Thread created with ID: {event.data.id}")
-                        if event.data.id:
-                            assistant_run_id = event.data.id
-                    elif isinstance(event, ThreadRunCreated):
-                        self._log(f"Thread run created with ID: {event.data.status}")
-                    elif isinstance(event, ThreadRunInProgress):
-                        self._log(f"Thread run in progress with status: {event.data.status}")
-                    elif isinstance(event, ThreadRunQueued):
-                        self._log(f"Thread run queued with status: {event.data.status}")
-                    elif isinstance(event, ThreadRunCompleted):
-                        self._log(f"Thread run completed with status: {event.data.status}")
-                    elif isinstance(event, ThreadRunFailed):
-                        self._log(f"Thread run failed with status: {event.data.status}")
-                        yield penelope_response_template(
-                            message=f"Thread run failed with status: {event.data.status}",
-                            id=assistant_run_id,
-                            type='error'
-                        )
-                        continue
-                    elif isinstance(event, ThreadRunCancelled):
-                        self._log(f"Thread run cancelled with status: {event.data.status}")
-                    elif isinstance(event, ThreadRunCancelling):
-                        self._log(f"Thread run cancelling with status: {event.data.status}")
-                    elif isinstance(event, ThreadRunExpired):
-                        self._log(f"Thread run expired with status: {event.data.status}")
-                        yield penelope_response_template(
-                            message=f"Thread run expired with status: {event.data.status}",
-                            id=event.data.id,
-                            type='error'
-                        )
-                        continue
-                    elif isinstance(event, ThreadRunRequiresAction):
-                        self._log(f"Thread run requires action with status: {event.data.status}")
-                    
-                        tool_outputs = self._process_tool_calls(event.data.required_action.
-                        submit_tool_outputs.tool_calls)
-                        self._log(f"Tool outputs: {tool_outputs}")
-                        if tool_outputs:
-                            self._log("Submitting tool outputs...")
-                            second_run = self.client.beta.threads.runs.submit_tool_outputs(
-                                thread_id=thread_id,
-                                run_id=event.data.id,
-                                tool_outputs=tool_outputs,
-                                stream=True
-                            )
-                            yield from process_run_events(second_run)
-                            self._log("--- Processed second run ---")
-                        else:
-                            self._log("No tool outputs to submit.")
-                            yield penelope_response_template(
-                                message="No tool outputs to submit.",
-                                id=event.data.id,
-                                type='error'
-                            )
-                            continue
-                    elif isinstance(event, ThreadRunIncomplete):
-                        self._log(f"Thread run incomplete with status: {event.data.status}")
-                        continue
-                    elif isinstance(event, ThreadRunStepCreated):
-                        self._log(f"Thread run step created with status: {event.data.status}")
-                        continue
-                    elif isinstance(event, ThreadRunStepInProgress):
-                        self._log(f"Thread run step in progress with status: {event.data.status}")
-                        continue
-                    elif isinstance(event, ThreadRunStepDelta):
-                        self._log(f"Thread run step delta with status: {event.data.id}")
-                    elif isinstance(event, ThreadRunStepCompleted):
-                        self._log(f"Thread run step completed with status: {event.data.status}")
-                    elif isinstance(event, ThreadRunStepFailed):
-                        self._log(f"Thread run step failed with status: {event.data.status}")
-                        yield penelope_response_template(
-                            message=f"Thread run step failed with status: {event.data.status}",
-                            id=event.data.id,
-                            type='error'
-                        )
-                        continue
-                    elif isinstance(event, ThreadRunStepCancelled):
-                        self._log(f"Thread run step cancelled with status: {event.data.status}")
-                        yield penelope_response_template(
-                            message=f"Thread run step cancelled with status: {event.data.status}",
-                                id=event.data.id,
-                            type='error'
-                        )
-                        continue
-                    elif isinstance(event, ThreadRunStepExpired):
-                        self._log(f"Thread run step expired with status: {event.data.status}")
-                        yield penelope_response_template(
-                            message=f"Thread run step expired with status: {event.data.status}",
-                            id=event.data.id,
-                            type='error'
-                        )
-                        continue
-                    elif isinstance(event, ThreadMessageCreated):
-                        self._log(f"Thread message created with ID: {event.data.status}")
-                    elif isinstance(event, ThreadMessageCompleted):
-                        self._log(f"Thread message completed with ID: {event.data.status}")
-                    elif isinstance(event, ThreadMessageInProgress):
-                        self._log(f"Thread message in progress with ID: {event.data.status}")
-                    elif isinstance(event, ThreadMessageIncomplete):
-                        self._log(f"Thread message incomplete with ID: {event.data.status}")
-                    elif isinstance(event, ThreadMessageDelta):
-                        # self._log(f"Thread message delta with ID: {event.data.id}")
-                        delta = event.data.delta
-                        if delta.content:
-                            for content_block in delta.content:
-                                if content_block.type == 'text':
-                                    chunk = content_block.text.value
-
-                                    yield penelope_response_template(
-                                        message=chunk,
-                                        id=event.data.id,
-                                        type='chunk'
-                                    )
-            
-            yield from process_run_events(run)
+            self._log("Assistant run created successfully")
+
+            yield from self._process_run_events(run, thread_id)
 
         except OpenAIError as e:
             error_msg = f"OpenAI API error in create_run_and_stream_response: {str(e)}"
@@ -879,6 +1221,103 @@ class Penelope:
                 type='error'
             )
 
+    def _process_run_events(self, run, thread_id: str) -> Generator[Dict[str, Any], None, None]:
+        """
+        Consume an assistant run stream, dispatching each event by its `event` name.
+
+        A handler may return a follow-up stream (after submitting tool outputs);
+        consumption then continues on that stream in the same loop, so chained
+        tool rounds do not nest generators.
+
+        Args:
+            run: The stream returned by the OpenAI runs API.
+            thread_id (str): The ID of the thread the run belongs to.
+
+        Yields:
+            Dict[str, Any]: Response chunks and errors produced by the event handlers.
+        """
+        since_yield = 0
+        # Checked once per run: unhandled events can arrive per token (e.g. step deltas)
+        log_events = self.verbose and logger.isEnabledFor(logging.DEBUG)
+        while run is not None:
+            stream, run = run, None
+            # Closing the stream releases its connection to the shared pool when it
+            # is left for a follow-up stream, finishes, or the client disconnects.
+            with stream:
+                for event in stream:
+                    handler = self._RUN_EVENT_HANDLERS.get(event.event)
+                    if handler is not None:
+                        run = yield from handler(self, event, thread_id)
+                    elif log_events:
+                        self._log("%s: %s", event.event, getattr(event.data, 'status', None))
+
+                    if run is not None:
+                        # The run paused for tool outputs; continue on the submitted stream
+                        break
+
+                    # A burst of buffered deltas never blocks on the socket, so give other
+                    # request threads (or greenlets) a turn every few events.
+                    since_yield += 1
+                    if since_yield >= self._EVENTS_PER_YIELD:
+                        time.sleep(0)
+                        since_yield = 0
+
+    def _on_message_delta(self, event, thread_id: str) -> Generator[Dict[str, Any], None, None]:
+        delta = event.data.delta
+        if delta.content:
+            for content_block in delta.content:
+                if content_block.type == 'text':
+                    yield penelope_response_template(
+                        message=content_block.text.value,
+                        id=event.data.id,
+                        type='chunk'
+                    )
+
+    def _on_run_error(self, event, thread_id: str) -> Generator[Dict[str, Any], None, None]:
+        # e.g. "thread.run.step.failed" -> "Thread run step failed with status: failed"
+        error_msg = f"{event.event.replace('.', ' ').capitalize()} with status: {event.data.status}"
+        self._log(error_msg)
+        yield penelope_response_template(
+            message=error_msg,
+            id=event.data.id,
+            type='error'
+        )
+
+    def _on_requires_action(self, event, thread_id: str) -> Generator[Dict[str, Any], None, Any]:
+        self._log("Thread run requires action with status: %s", event.data.status)
+
+        tool_calls = event.data.required_action.submit_tool_outputs.tool_calls
+        tool_outputs = self._process_tool_calls(tool_calls) if tool_calls else []
+        self._log("Tool outputs: %s", tool_outputs)
+        if tool_outputs:
+            self._log("Submitting tool outputs...")
+            return self.client.beta.threads.runs.submit_tool_outputs(
+                thread_id=thread_id,
+                run_id=event.data.id,
+                tool_outputs=tool_outputs,
+                stream=True
+            )
+        else:
+            self._log("No tool outputs to submit.")
+            yield penelope_response_template(
+                message="No tool outputs to submit.",
+                id=event.data.id,
+                type='error'
+            )
+
+    _EVENTS_PER_YIELD = 32
+
+    # Run stream events are dispatched on their `event` name; anything not listed is only logged.
+    _RUN_EVENT_HANDLERS = {
+        "thread.message.delta": _on_message_delta,
+        "thread.run.requires_action": _on_requires_action,
+        "thread.run.failed": _on_run_error,
+        "thread.run.expired": _on_run_error,
+        "thread.run.step.failed": _on_run_error,
+        "thread.run.step.cancelled": _on_run_error,
+        "thread.run.step.expired": _on_run_error,
+    }
+
     def cancel_run(self, thread_id: str, run_id: str) -> Dict[str, Any]:
         """
         Cancel a run that is currently in progress.
@@ -890,7 +1329,7 @@ class Penelope:
         Returns:
             Dict[str, Any]: A dictionary containing the result of the operation.
         """
-        self._log(f"Attempting to cancel run {run_id} in thread {thread_id}")
+        self._log("Attempting to cancel run %s in thread %s", run_id, thread_id)
 
         try:
             cancelled_run = self.client.beta.threads.runs.cancel(
@@ -898,7 +1337,7 @@ class Penelope:
                 run_id=run_id
             )
 
-            self._log(f"Run {run_id} cancelled successfully. New status: {cancelled_run.status}")
+            self._log("Run %s cancelled successfully. New status: %s", run_id, cancelled_run.status)
 
             return method_response_template(
                 message=f"Run {run_id} cancelled successfully",
@@ -923,7 +1362,18 @@ class Penelope:
                 success=False
             )
 
-    def handle_file_uploads(self, files: List[FileStorage], thread_id: str, user_id: str, message_id: str) -> Dict[str, Any]:
+    def _upload_file(self, file: FileStorage, file_extension: str):
+        purpose = "vision" if file_extension.endswith(('png', 'jpg', 'jpeg')) else "assistants"
+        self._log("Uploading %s with purpose: %s", file.filename, purpose)
+        # Hand httpx the (name, stream, type) tuple so the multipart body is
+        # streamed from Werkzeug's spooled upload rather than buffered in memory.
+        file.stream.seek(0)
+        return self.client.files.create(
+            file=(file.filename, file.stream, file.content_type),
+            purpose=purpose
+        )
+
+    def handle_file_uploads(self, files: List[FileStorage], thread_id: str, user_id: str, message_id: str, db=None) -> Dict[str, Any]:
         """
         Handle file uploads for the OpenAI Assistant API and local database.
 
@@ -931,29 +1381,13 @@ class Penelope:
         files (List[FileStorage]): List of file objects to upload.
         thread_id (str): The ID of the thread to associate the files with.
         user_id (str): The ID of the user uploading the files.
+        message_id (str): The ID of the message the files are attached to.
+        db (optional): An open database session to add the file rows to. The caller
+            owns the commit; when omitted, a new session is opened and committed here.
 
         Returns:
         Dict[str, Any]: A dictionary containing the result of the operation.
         """
-        supported_extensions = [
-            'c', 'cs', 'cpp', 'doc', 'docx', 'html', 'java', 'json', 'md', 'pdf', 'php', 
-            'pptx', 'py', 'rb', 'tex', 'txt', 'css', 'js', 'sh', 'ts', 'csv', 'jpeg', 
-            'jpg', 'gif', 'png', 'tar', 'xlsx', 'xml', 'zip'
-        ]
-        supported_mime_types = {
-            'text/x-c', 'text/x-csharp', 'text/x-c++', 'application/msword',
-            'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-            'text/html', 'text/x-java', 'application/json', 'text/markdown',
-            'application/pdf', 'text/x-php',
-            'application/vnd.openxmlformats-officedocument.presentationml.presentation',
-            'text/x-python', 'text/x-script.python', 'text/x-ruby', 'text/x-tex',
-            'text/plain', 'text/css', 'text/javascript', 'application/x-sh',
-            'application/typescript', 'application/csv', 'image/jpeg', 'image/gif',
-            'image/png', 'application/x-tar',
-            'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            'application/xml', 'text/xml', 'application/zip'
-        }
-
         files_ids = []
         MAX_FILE_SIZE_MB = 512  # OpenAI's maximum file size in MB
 
@@ -964,47 +1398,55 @@ class Penelope:
                 file.seek(0)  # Reset file pointer
                 return size_bytes / (1024 * 1024)  # Convert to MB
 
-            with self.get_db_session() as db:
-                for file in files:
-                    self._log(f"File name: {file.filename}")
-                    file_extension = file.filename.split('.')[-1].lower()
-                    self._log(f"File extension: {file_extension}")
-                    
-                    # Check file size
-                    file_size_mb = get_file_size_mb(file.stream)
-                    self._log(f'File size: {file_size_mb}')
-                    if file_size_mb > MAX_FILE_SIZE_MB:
-                        self._log(f"File too large: {file.filename} ({file_size_mb:.2f} MB)")
-                        return method_response_template(
-                            message=f"File too large: {file.filename} ({file_size_mb:.2f} MB). Maximum allowed size is {MAX_FILE_SIZE_MB} MB.",
-                            data=None,
-                            success=False
-                        )
+            # Validate every file first so nothing is uploaded for a rejected batch
+            accepted = []
+            for file in files:
+                self._log("File name: %s", file.filename)
+                file_extension = os.path.splitext(file.filename)[1][1:].lower()
+                self._log("File extension: %s", file_extension)
+                
+                # Check file size
+                file_size_mb = get_file_size_mb(file.stream)
+                self._log("File size: %s", file_size_mb)
+                if file_size_mb > MAX_FILE_SIZE_MB:
+                    self._log("File too large: %s (%.2f MB)", file.filename, file_size_mb)
+                    return method_response_template(
+                        message=f"File too large: {file.filename} ({file_size_mb:.2f} MB). Maximum allowed size is {MAX_FILE_SIZE_MB} MB.",
+                        data=None,
+                        success=False
+                    )
 
-                    if file_extension not in supported_extensions:
-                        self._log(f"Unsupported file type: {file.filename}")
-                        return method_response_template(
-                            message=f"Unsupported file type: {file.filename}",
-                            data=None,
-                            success=False
-                        )
-                    
-                    if hasattr(file, 'content_type') and file.content_type not in supported_mime_types:
-                        self._log(f"Unsupported MIME type: {file.content_type}")
-                        continue
+                if file_extension not in SUPPORTED_FILE_EXTENSIONS:
+                    self._log("Unsupported file type: %s", file.filename)
+                    return method_response_template(
+                        message=f"Unsupported file type: {file.filename}",
+                        data=None,
+                        success=False
+                    )
+                
+                if hasattr(file, 'content_type') and file.content_type not in SUPPORTED_MIME_TYPES:
+                    self._log("Unsupported MIME type: %s", file.content_type)
+                    continue
+
+                accepted.append((file, file_extension, file_size_mb))
 
+            # Uploads are independent, so run them concurrently rather than one by one
+            uploads = [
+                (file, file_size_mb, self._upload_executor.submit(self._upload_file, file, file_extension))
+                for file, file_extension, file_size_mb in accepted
+            ]
+
+            with (nullcontext(db) if db is not None else self.get_db_session()) as db:
+                for file, file_size_mb, upload in uploads:
                     try:
-                        # Upload to OpenAI
-                        purpose = "vision" if file_extension.endswith(('png', 'jpg', 'jpeg')) else "assistants"
-                        self._log(f"Uploading file with purpose: {purpose}")
-                        file_response = self.client.files.create(file=file.stream, purpose=purpose)
+                        file_response = upload.result()
                     
                         if file_response.status == 'processed':
                             openai_file_id = file_response.id
                             files_ids.append(openai_file_id)
-                            self._log(f"File uploaded successfully: {file.filename}")
+                            self._log("File uploaded successfully: %s", file.filename)
                         else:
-                            self._log(f"File upload failed: {file}")
+                            self._log("File upload failed: %s", file)
                             return method_response_template(
                                 message=f"File upload failed: {file.filename}",
                                 data=None,
@@ -1014,13 +1456,6 @@ class Penelope:
                         # Reset file pointer
                         file.stream.seek(0)
 
-                        # Update Thread with file
-                        self.client.beta.threads.update(
-                            thread_id=thread_id,
-                            tool_resources= {"code_interpreter": {"file_ids": files_ids}}
-                        )
-                        self._log(f'File {file.filename} associated with thread {thread_id}')
-
                         # Save to database
                         db_file = File(
                             openai_file_id=openai_file_id,
@@ -1033,16 +1468,24 @@ class Penelope:
                             message_id=message_id
                         )
                         db.add(db_file)
-                        self._log(f"File {file.filename} saved to database and associated with message {message_id}")
+                        self._log("File %s saved to database and associated with message %s", file.filename, message_id)
 
                     except OpenAIError as e:
-                        self._log(f"Error uploading file {file.filename} to OpenAI: {str(e)}")
+                        self._log("Error uploading file %s to OpenAI: %s", file.filename, e)
                     except SQLAlchemyError as e:
-                        self._log(f"Error saving file {file.filename} to database: {str(e)}")
+                        self._log("Error saving file %s to database: %s", file.filename, e)
                     except Exception as e:
-                        self._log(f"Unexpected error uploading file {file.filename}: {str(e)}")
+                        self._log("Unexpected error uploading file %s: %s", file.filename, e)
 
-            self._log(f"Files uploaded successfully. len: {len(files_ids)}, ids: {files_ids}")
+            # Associate all uploaded files with the thread in a single update
+            if files_ids:
+                self.client.beta.threads.update(
+                    thread_id=thread_id,
+                    tool_resources= {"code_interpreter": {"file_ids": files_ids}}
+                )
+                self._log("Files %s associated with thread %s", files_ids, thread_id)
+
+            self._log("Files uploaded successfully. len: %s, ids: %s", len(files_ids), files_ids)
             return method_response_template(
                 message=f"Successfully uploaded {len(files_ids)} files",
                 data=files_ids,
@@ -1050,7 +1493,7 @@ class Penelope:
             )
 
         except Exception as e:
-            self._log(f"Error in handle_file_uploads: {str(e)}")
+            self._log("Error in handle_file_uploads: %s", e)
             return method_response_template(
                 message=f"Error handling file uploads: {str(e)}",
                 data=None,
@@ -1086,7 +1529,7 @@ class Penelope:
         filename = f"flowchart_{uuid.uuid4().hex[:8]}"
         file_path = dot.render(filename=filename, directory='./static/flowcharts', format='png', cleanup=True)
         
-        self._log(f"Flowchart generated: {file_path}")
+        self._log("Flowchart generated: %s", file_path)
         return file_path
 
     def generate_image(self, prompt: str, size: str = "1024x1024", n: int = 1, style: Literal['vivid', 'natural'] = 'vivid') -> List[str]:
@@ -1113,7 +1556,29 @@ class Penelope:
         return [image.url for image in response.data]
     
 
-penelope_manager = Penelope(verbose=True)
+_penelope = None
+_penelope_lock = threading.Lock()
+
+
+def get_penelope() -> Penelope:
+    """
+    Return the process-wide Penelope instance, creating it on first use.
+
+    Penelope holds no per-request state: thread and user IDs are passed to every
+    method, each DB operation opens its own session, and its caches and executors
+    are thread-safe. Sharing one instance keeps the pooled clients and caches warm,
+    while building it lazily keeps imports cheap and moves the start-up network
+    calls out of module import.
+
+    Returns:
+        Penelope: The shared Penelope instance.
+    """
+    global _penelope
+    if _penelope is None:
+        with _penelope_lock:
+            if _penelope is None:
+                _penelope = Penelope(verbose=True)
+    return _penelope
 
 
 
@@ -1148,9 +1613,9 @@ penelope_manager = Penelope(verbose=True)
     #         ValueError: If the thread_id is invalid.
     #     """
     #     try:
-    #         self._log(f"Retrieving messages from thread {thread_id}...")
+    #         self._log("Retrieving messages from thread %s...", thread_id)
     #         messages = self.client.beta.threads.messages.list(thread_id=thread_id)
-    #         self._log(f"Retrieved {len(messages.data)} messages.")
+    #         self._log("Retrieved %s messages.", len(messages.data))
     #         return method_response_template(
     #             message=f"Successfully retrieved {len(messages.data)} messages from thread {thread_id}.",
     #             data=messages,
@@ -1295,7 +1760,7 @@ penelope_manager = Penelope(verbose=True)
     #                     "filename": cited_file.filename
     #                 })
     #             except Exception as e:
-    #                 self._log(f"Error retrieving file citation: {str(e)}")
+    #                 self._log("Error retrieving file citation: %s", e)
     #         elif annotation.file_path:
     #             try:
     #                 cited_file = self.client.files.retrieve(annotation.file_path.file_id)
@@ -1305,7 +1770,7 @@ penelope_manager = Penelope(verbose=True)
     #                     "filename": cited_file.filename
     #                 })
     #             except Exception as e:
-    #                 self._log(f"Error retrieving file path: {str(e)}")
+    #                 self._log("Error retrieving file path: %s", e)
 
     #     return {
     #         "text": processed_text,
@@ -2,19 +2,25 @@
 # Initialization of the vector store package
 """
 
+from functools import lru_cache
 from .vector_store import VectorStoreManager
 
-__all__ = ['VectorStoreManager']
+__all__ = ['VectorStoreManager', 'get_manager']
 __version__ = '0.1.0'
 __author__ = 'David'
 
 
 
-# Vector store manager initialization
-manager = VectorStoreManager()
+# Vector store manager initialization, deferred to first use so importing the
+# package doesn't build an OpenAI client (or require OPENAI_API_KEY)
+@lru_cache(maxsize=None)
+def get_manager() -> VectorStoreManager:
+    return VectorStoreManager()
 
 # Example usage of the vector store manager
 
+# manager = get_manager()
+
 # create a vector store
 # new_vector_store = manager.create_vector_store(
 #     name="protocols",
@@ -3,8 +3,11 @@
 """
 
 from app.utils.response_template import method_response_template
-from typing import List, Dict, Any, Optional, Literal
+from app.utils.http_client import openai_http_client
+from typing import List, Dict, Any, Optional, Literal, Iterable, Iterator
+from itertools import islice
 from werkzeug.datastructures import FileStorage
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from openai import OpenAI
 import contextlib
 import logging
@@ -18,9 +21,11 @@ class VectorStoreManager:
             raise ValueError("OpenAI API key not provided and OPENAI_API_KEY environment variable not set") 
         
         self.verbose = verbose
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = OpenAI(api_key=self.api_key, http_client=openai_http_client)
         self.logger = logging.getLogger(__name__)
         self.extensions = ['.pdf', '.txt']
+        # Batches are uploaded a few at a time; more would just trip OpenAI's upload limits
+        self.max_concurrent_batches = 4
 
         if self.verbose:
             logging.basicConfig(level=logging.DEBUG)
@@ -50,7 +55,7 @@ class VectorStoreManager:
                 name=name,
                 file_ids=file_ids or [],
             )
-            self.log_debug(f"Vector store created successfully: {vector_store.id}")
+            self.log_debug("Vector store created successfully: %s", vector_store.id)
             return method_response_template(message="Vector store created successfully", 
                                              data=vector_store.model_dump(), 
                                              success=True
@@ -85,9 +90,9 @@ class VectorStoreManager:
                 order=order,
                 after=after
             )
-            self.log_debug(f"Successfully retrieved {len(vector_stores.data)} vector stores")
+            self.log_debug("Successfully retrieved %s vector stores", len(vector_stores.data))
             return method_response_template(message=f"Successfully retrieved {len(vector_stores.data)} vector stores", 
-                                             data=[vs.model_dump() for vs in vector_stores.data], 
+                                             data=[vs.model_dump(mode="json") for vs in vector_stores.data], 
                                              success=True
                                              )
         except Exception as e:
@@ -113,9 +118,9 @@ class VectorStoreManager:
             Exception: If there's an error during the deletion process.
         """
         try:
-            self.log_debug(f"Attempting to delete vector store with ID: {vector_store_id}")
+            self.log_debug("Attempting to delete vector store with ID: %s", vector_store_id)
             deleted_vector_store = self.client.beta.vector_stores.delete(vector_store_id)
-            self.log_debug(f"Successfully deleted vector store with ID: {vector_store_id}")
+            self.log_debug("Successfully deleted vector store with ID: %s", vector_store_id)
             return method_response_template(
                 message="Vector store deleted successfully",
                 data=deleted_vector_store.model_dump(),
@@ -147,12 +152,12 @@ class VectorStoreManager:
             Exception: If there's an error during the update process.
         """
         try:
-            self.log_debug(f"Attempting to update vector store with ID: {vector_store_id}")
+            self.log_debug("Attempting to update vector store with ID: %s", vector_store_id)
             updated_vector_store = self.client.beta.vector_stores.update(
                 vector_store_id,
                 name=name,
             )
-            self.log_debug(f"Successfully updated vector store with ID: {vector_store_id}")
+            self.log_debug("Successfully updated vector store with ID: %s", vector_store_id)
             return method_response_template(
                 message="Vector store updated successfully",
                 data=updated_vector_store.model_dump(),
@@ -200,9 +205,9 @@ class VectorStoreManager:
                 after=after,
                 filter=filter
             )
-            file_list = [file.model_dump() for file in files.data]
+            file_list = [file.model_dump(mode="json") for file in files.data]
 
-            self.log_debug(f"Successfully retrieved {len(file_list)} files from vector store {vector_store_id}.")
+            self.log_debug("Successfully retrieved %s files from vector store %s.", len(file_list), vector_store_id)
             return method_response_template(
                 message="Successfully retrieved vector store files",
                 data={
@@ -214,7 +219,7 @@ class VectorStoreManager:
                 success=True
             )
         except Exception as e:
-            self.log_debug(f"Error listing vector store files: {str(e)}")
+            self.log_debug("Error listing vector store files: %s", e)
             return method_response_template(
                 message=f"Failed to list vector store files: {str(e)}",
                 data={"vector_store_id": vector_store_id, "limit": limit, "order": order, "after": after, "filter": filter},
@@ -247,15 +252,8 @@ class VectorStoreManager:
             if not os.path.exists(root_folder):
                 raise FileNotFoundError(f"The specified root folder '{root_folder}' does not exist.")
 
-            file_paths = []
             extensions_used = extensions if extensions is not None else self.extensions
-
-            for root, _, files in os.walk(root_folder):
-                for file_name in files:
-                    file_path = os.path.join(root, file_name)
-                    _, file_ext = os.path.splitext(file_name)
-                    if file_ext.lower() in extensions_used:
-                        file_paths.append(file_path)
+            file_paths = list(self.iter_file_paths(root_folder, extensions_used))
 
             return method_response_template(
                 message="Successfully listed documents",
@@ -268,24 +266,53 @@ class VectorStoreManager:
             )
 
         except PermissionError as pe:
-            self.log_debug(f"Permission error: {str(pe)}")
+            self.log_debug("Permission error: %s", pe)
             return method_response_template(
                 message=f"Permission error: {str(pe)}",
                 data={"root_folder": root_folder},
                 success=False
             )
         except Exception as e:
-            self.log_debug(f"Error listing documents in {root_folder}: {str(e)}")
+            self.log_debug("Error listing documents in %s: %s", root_folder, e)
             return method_response_template(
                 message=f"Error listing documents: {str(e)}",
                 data={"root_folder": root_folder},
                 success=False
             )
     
+    def iter_file_paths(self, root_folder: str, extensions: Optional[List[str]] = None) -> Iterator[str]:
+        """
+        Lazily yield absolute paths to documents within a root folder, filtered by extensions.
+
+        Paths are produced while the tree is walked, so uploads can start on the
+        first batch before the rest of a large corpus has been listed.
+
+        Args:
+            root_folder (str): The root folder to start the search from.
+            extensions (Optional[List[str]]): List of file extensions to filter. If None, uses self.extensions.
+
+        Yields:
+            str: The path of each matching file.
+        """
+        extensions_used = extensions if extensions is not None else self.extensions
+        extension_set = frozenset(extension.lower() for extension in extensions_used)
+
+        # scandir entries carry their name and type, saving a stat per file over os.walk + splitext
+        pending = [root_folder]
+        while pending:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.is_file():
+                        stem, dot, file_ext = entry.name.rpartition('.')
+                        if stem and dot and '.' + file_ext.lower() in extension_set:
+                            yield entry.path
+
     def add_local_files_to_vector_store(
         self,
         vector_store_id: str,
-        file_paths: List[str],
+        file_paths: Iterable[str],
         batch_size: int = 200,
     ) -> Dict[str, Any]:
         """
@@ -296,7 +323,8 @@ class VectorStoreManager:
 
         Args:
             vector_store_id (str): The ID of the vector store to update.
-            file_paths (List[str]): A list of local file paths to add to the vector store.
+            file_paths (Iterable[str]): Local file paths to add to the vector store, e.g. from
+                `iter_file_paths`; they are consumed one batch at a time.
             batch_size (int, optional): The number of files to process in each batch. Defaults to 200.
             name (Optional[str], optional): New name for the vector store. Defaults to None.
             description (Optional[str], optional): New description for the vector store. Defaults to None.
@@ -314,21 +342,38 @@ class VectorStoreManager:
             This method uses the OpenAI API's beta vector stores functionality.
         """
         try:
-            total_files_added = 0
-            batch_results = []
-
-            for i in range(0, len(file_paths), batch_size):
-                batch_paths = file_paths[i:i + batch_size]
+            def upload_batch(batch) -> Optional[Dict[str, Any]]:
+                batch_number, batch_paths = batch
                 with self._open_file_streams(batch_paths) as file_streams:
-                    if file_streams:
-                        batch_result = self._process_local_files_batch(vector_store_id, file_streams, i, batch_size)
-                        batch_results.append(batch_result)
-                        total_files_added += batch_result['file_counts'].completed
-                    else:
-                        self.log_debug(f"Batch {i // batch_size + 1}: No valid files to upload.")
+                    if not file_streams:
+                        self.log_debug("Batch %s: No valid files to upload.", batch_number + 1)
+                        return None
+                    return self._process_local_files_batch(vector_store_id, file_streams, batch_number * batch_size, batch_size)
+
+            # Peel off one batch of paths at a time, so a lazy source is never listed in full first
+            paths = iter(file_paths)
+            batches = enumerate(iter(lambda: list(islice(paths, batch_size)), []))
+
+            # Each batch is uploaded and polled independently, so several run at once.
+            # The next batch is only read once a running one finishes: Executor.map
+            # would consume the whole source up front.
+            results = {}
+            with ThreadPoolExecutor(max_workers=self.max_concurrent_batches) as executor:
+                in_flight = {}
+                for batch in islice(batches, self.max_concurrent_batches):
+                    in_flight[executor.submit(upload_batch, batch)] = batch[0]
+                while in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        results[in_flight.pop(future)] = future.result()
+                        batch = next(batches, None)
+                        if batch is not None:
+                            in_flight[executor.submit(upload_batch, batch)] = batch[0]
+
+            batch_results = [results[number] for number in sorted(results) if results[number] is not None]
 
             return {
-                "total_files_added": total_files_added,
+                "total_files_added": self._count_completed_files(batch_results),
                 "batch_results": batch_results
             }
 
@@ -337,7 +382,7 @@ class VectorStoreManager:
             self.log_debug(error_message)
             return method_response_template(
                 message=error_message,
-                data={"vector_store_id": vector_store_id, "file_paths": file_paths, "batch_size": batch_size},
+                data={"vector_store_id": vector_store_id, "batch_size": batch_size},
                 success=False
             )
 
@@ -352,10 +397,10 @@ class VectorStoreManager:
             return {
                 "batch_number": start_index // batch_size + 1,
                 "status": file_batch.status,
-                "file_counts": file_batch.file_counts
+                "file_counts": file_batch.file_counts.model_dump()
             }
         except Exception as e:
-            self.log_debug(f"Error in batch {start_index // batch_size + 1}: {str(e)}")
+            self.log_debug("Error in batch %s: %s", start_index // batch_size + 1, e)
             return {
                 "batch_number": start_index // batch_size + 1,
                 "error": str(e)
@@ -368,17 +413,17 @@ class VectorStoreManager:
         batch_size: int = 200,
     ) -> Dict[str, Any]:
         try:
-            total_files_added = 0
-            batch_results = []
-
-            for i in range(0, len(files), batch_size):
-                batch_files = files[i:i + batch_size]
-                batch_result = self._process_file_batch(vector_store_id, batch_files, i, batch_size)
-                batch_results.append(batch_result)
-                total_files_added += batch_result['file_counts'].completed
+            # Each batch is uploaded and polled independently, so several run at once
+            with ThreadPoolExecutor(max_workers=self.max_concurrent_batches) as executor:
+                batch_results = list(executor.map(
+                    lambda start_index: self._process_file_batch(
+                        vector_store_id, files[start_index:start_index + batch_size], start_index, batch_size
+                    ),
+                    range(0, len(files), batch_size)
+                ))
 
             return {
-                "total_files_added": total_files_added,
+                "total_files_added": self._count_completed_files(batch_results),
                 "batch_results": batch_results
             }
 
@@ -401,28 +446,38 @@ class VectorStoreManager:
             return {
                 "batch_number": start_index // batch_size + 1,
                 "status": file_batch.status,
-                "file_counts": file_batch.file_counts
+                "file_counts": file_batch.file_counts.model_dump()
             }
         except Exception as e:
-            self.log_debug(f"Error in batch {start_index // batch_size + 1}: {str(e)}")
+            self.log_debug("Error in batch %s: %s", start_index // batch_size + 1, e)
             return {
                 "batch_number": start_index // batch_size + 1,
                 "error": str(e)
             }
     
+    @staticmethod
+    def _count_completed_files(batch_results: List[Dict[str, Any]]) -> int:
+        """Sum the completed file counts of the batches that did not fail."""
+        return sum(result['file_counts']['completed'] for result in batch_results if 'file_counts' in result)
+
     @contextlib.contextmanager
     def _open_file_streams(self, paths: List[str]):
-        """Context manager to safely open and close file streams."""
-        file_streams = []
-        try:
-            for path in paths:
-                if os.path.exists(path):
-                    file_streams.append(open(path, "rb"))
-                else:
-                    self.log_debug(f"File not found: {path}")
+        """Context manager to safely open and close file streams; files are opened in parallel."""
+        def open_binary(path: str):
+            try:
+                return open(path, "rb")
+            except FileNotFoundError:
+                self.log_debug("File not found: %s", path)
+                return None
+
+        with contextlib.ExitStack() as stack:
+            # Opens are latency-bound on network filesystems, so overlap them
+            with ThreadPoolExecutor(max_workers=16) as executor:
+                file_streams = [
+                    stack.enter_context(stream)
+                    for stream in executor.map(open_binary, paths)
+                    if stream is not None
+                ]
             yield file_streams
-        finally:
-            for file in file_streams:
-                file.close()
 
 
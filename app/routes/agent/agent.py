@@ -1,7 +1,7 @@
 # Agent endpoints to create, update, delete, get agents using OpenAI API
 
-from flask import Blueprint, request, jsonify
-from app.penelope.penelope import penelope_manager
+from flask import Blueprint, request
+from app.penelope.penelope import get_penelope
 from app.utils.response_template import method_response_template
 
 agent_bp = Blueprint('agent', __name__)
@@ -9,7 +9,7 @@ agent_bp = Blueprint('agent', __name__)
 @agent_bp.route('/agents', methods=['GET'])
 def get_agents():
     try:
-        result = penelope_manager.assistant_manager.list_assistants()
+        result = get_penelope().assistant_manager.list_assistants()
         if result['success']:
             return method_response_template(message="Successfully retrieved assistants", 
                                              data=result['data'], 
@@ -40,7 +40,7 @@ def update_agent(agent_id):
                                              data=None, 
                                              success=False), 400
         
-        result = penelope_manager.assistant_manager.update_assistant(agent_id, **update_data)
+        result = get_penelope().assistant_manager.update_assistant(agent_id, **update_data)
         if result['success']:
             return method_response_template(message="Successfully updated assistant", 
                                              data=result['data'], 
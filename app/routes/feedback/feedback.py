@@ -1,14 +1,44 @@
+import time
 import psutil
+import threading
 from http import HTTPStatus
 from flask import current_app
 from werkzeug.exceptions import BadRequest
-from app.penelope.penelope import penelope_manager
+from app.penelope.penelope import get_penelope
 from app.utils.response_template import response_template
 from flask import Blueprint, request, render_template
 
 feedback_bp = Blueprint('feedback_bp', __name__,
                                  template_folder='templates')
 
+# Seconds the welcome page reuses a system metrics sample
+METRICS_TTL = 5
+_metrics_cache = {'t': 0.0, 'v': None}
+_metrics_lock = threading.Lock()
+
+
+def get_metrics():
+    """
+    Return system metrics, sampled at most once every `METRICS_TTL` seconds.
+
+    Listing the process threads walks /proc/self/task, so bursts of traffic on
+    the welcome page share one sample instead of each taking their own.
+
+    Returns:
+        dict: CPU and memory usage, active thread count and boot time.
+    """
+    with _metrics_lock:
+        now = time.monotonic()
+        if _metrics_cache['v'] is None or now - _metrics_cache['t'] > METRICS_TTL:
+            _metrics_cache['v'] = {
+                'cpu_usage': psutil.cpu_percent(),
+                'memory_usage': psutil.virtual_memory().percent,
+                'active_threads': len(psutil.Process().threads()),
+                'uptime': int(psutil.boot_time()),
+            }
+            _metrics_cache['t'] = now
+        return _metrics_cache['v']
+
 
 @feedback_bp.route('/update_feedback', methods=['POST'])
 def update_feedback():
@@ -41,7 +71,7 @@ def update_feedback():
                 status_code=HTTPStatus.BAD_REQUEST
             )
 
-        response = penelope_manager.update_message_feedback(message_id, feedback)
+        response = get_penelope().update_message_feedback(message_id, feedback)
         if response['success']:
             return response_template(
                 message=response.get('message'),
@@ -92,10 +122,7 @@ def welcome():
         200: Welcome page rendered successfully with system metrics.
     """
     metrics = {
-        'cpu_usage': psutil.cpu_percent(),
-        'memory_usage': psutil.virtual_memory().percent,
-        'active_threads': len(psutil.Process().threads()),
-        'uptime': int(psutil.boot_time()),
-        'routes_count': len(current_app.url_map._rules)
+        **get_metrics(),
+        'routes_count': current_app.config['ROUTES_COUNT']
     }
     return render_template('template.html', metrics=metrics)
\ No newline at end of file
@@ -1,5 +1,5 @@
-from flask import Flask, request, jsonify, Blueprint
-from app.penelope.image_generator_module.image import image_generator
+from flask import request, jsonify, Blueprint
+from app.penelope.image_generator_module.image import get_image_generator
 
 image_bp = Blueprint('image_bp', __name__)
 
@@ -24,7 +24,7 @@ def generate_image():
         return jsonify({'error': 'Style must be either "vivid" or "natural"'}), 400
 
     try:
-        image_urls = image_generator.generate_image(prompt=prompt, n=int(number_images), style=style)
+        image_urls = get_image_generator().generate_image(prompt=prompt, n=int(number_images), style=style)
         return jsonify({'image_urls': image_urls}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
@@ -3,24 +3,33 @@
 """
 
 import json
+import orjson
 from http import HTTPStatus
-from werkzeug.exceptions import BadRequest
-from app.penelope.penelope import penelope_manager
+from app.penelope.penelope import get_penelope
 from flask import Response, stream_with_context, request, Blueprint
 from app.utils.response_template import penelope_response_template
+from app.utils.streaming import coalesce_chunks
 inference_bp = Blueprint('inference_bp', __name__)
 
+_dumps = orjson.dumps
+
+
+def _sse_frame(event):
+    """Encode an event as a `data:` SSE frame, as bytes so Flask writes it without re-encoding."""
+    return b"data: " + _dumps(event) + b"\n\n"
+
+
 @inference_bp.route('/inference', methods=['POST'])
 def penelope_inference():
     def stream_response(generator):
-        for chunk in generator:
-            yield f"data: {json.dumps(chunk)}\n\n"
+        for chunk in coalesce_chunks(generator):
+            yield _sse_frame(chunk)
 
     def stream_error(message, status_code):
         error_data = penelope_response_template(message, type='error')
         
         def error_generator():
-            yield f"data: {json.dumps(error_data)}\n\n"
+            yield _sse_frame(error_data)
         
         return Response(
             stream_with_context(error_generator()),
@@ -51,7 +60,7 @@ def penelope_inference():
 
         # Generate response
         try:
-            generator = penelope_manager.generate_penelope_response_streaming(
+            generator = get_penelope().generate_penelope_response_streaming(
                 user_prompt, user_id, username, files, thread_id
             )
             return Response(
@@ -1,41 +1,73 @@
 # Messages routes
 
-from flask import Blueprint
+import logging
+from flask import Blueprint, Response, current_app, stream_with_context
+from sqlalchemy.orm import selectinload
 from http import HTTPStatus
-from config import Session, Message, File
+from itertools import chain
+from config import SessionLocal, Message
 from app.utils.response_template import response_template
-from app.penelope.penelope import penelope_manager
 
 
+logger = logging.getLogger(__name__)
+
 messages_bp = Blueprint('messages', __name__)
 
+# Messages are fetched and serialized in batches of this size while the response streams
+MESSAGES_BATCH_SIZE = 200
+
 @messages_bp.route('/messages/<thread_id>', methods=['GET'])
 def get_messages(thread_id):
     """
     Get all messages with their associated files for a thread, ordered chronologically.
+
+    The body is streamed as it is read from a server-side cursor, so long threads
+    never sit in memory as ORM objects and dicts at once and the first bytes go
+    out before the last rows are fetched. The JSON has the same shape as
+    `response_template`.
     """
-    try:
-        with Session() as session:
-            messages = session.query(Message).filter_by(thread_id=thread_id).order_by(Message.created_at.asc()).all()
-            
-            message_data = []
-            for message in messages:
+    def generate():
+        session = SessionLocal()
+        # Files for each batch of messages come from one extra IN query
+        messages = iter(
+            session.query(Message)
+            .options(selectinload(Message.files))
+            .filter_by(thread_id=thread_id)
+            .order_by(Message.created_at.asc())
+            .execution_options(stream_results=True)
+            .yield_per(MESSAGES_BATCH_SIZE)
+        )
+        message = next(messages, None)
+
+        yield '{"message": "Messages with associated files retrieved successfully", "data": {"messages": ['
+        separator = ''
+        error = None
+        try:
+            while message is not None:
                 message_dict = message.as_dict()
-                message_files = session.query(File).filter_by(message_id=message.id).all()
-                message_dict['files'] = [file.as_dict() for file in message_files]
-                message_data.append(message_dict)
-            
-            return response_template(
-                message="Messages with associated files retrieved successfully",
-                data={
-                    "messages": message_data
-                },
-                status_code=HTTPStatus.OK
-            )
+                message_dict['files'] = [file.as_dict() for file in message.files]
+                yield separator + current_app.json.dumps(message_dict)
+                separator = ','
+                message = next(messages, None)
+        except Exception as e:
+            # The 200 is already sent; close the document so the client can still parse
+            # it, and report the failure in `error` alongside the messages read so far
+            logger.exception("Error streaming messages for thread %s", thread_id)
+            error = f'An unexpected error occurred: {str(e)}'
+        yield ']}, "error": ' + current_app.json.dumps(error) + '}'
+
+    try:
+        # Run the query before committing to a 200, so database errors still get a 500
+        body = generate()
+        first_part = next(body)
+        return Response(
+            stream_with_context(chain([first_part], body)),
+            status=HTTPStatus.OK,
+            mimetype='application/json'
+        )
     except Exception as e:
         return response_template(
             message='Internal Server Error',
             error=f'An unexpected error occurred: {str(e)}',
             status_code=HTTPStatus.INTERNAL_SERVER_ERROR
         )
-
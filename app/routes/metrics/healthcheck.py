@@ -1,9 +1,21 @@
 # app/routes/metrics/healthcheck.py
 
+import logging
 from flask import Blueprint, jsonify
+from config import engine
+
+logger = logging.getLogger(__name__)
 
 healthcheck_bp = Blueprint('healthcheck', __name__)
 
 @healthcheck_bp.route('/health', methods=['GET'])
 def health():
-    return jsonify({"status": "ok"}), 200
\ No newline at end of file
+    # Monitoring polls this endpoint, which makes it a cheap periodic view of pool pressure
+    pool_status = engine.pool.status()
+    # Probes are frequent; only log at a visible level when the pool has spilled
+    # into overflow connections
+    if engine.pool.overflow() > 0:
+        logger.warning("DB pool in overflow: %s", pool_status)
+    else:
+        logger.debug("DB pool: %s", pool_status)
+    return jsonify({"status": "ok", "db_pool": pool_status}), 200
@@ -5,9 +5,8 @@
 import bcrypt
 from app.utils.response_template import response_template
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from flask import Blueprint, jsonify, request
-from config import Session, User
-from datetime import datetime
+from flask import Blueprint, request
+from config import SessionLocal, User
 from http import HTTPStatus
 
 register_bp = Blueprint('register_bp', __name__)  
@@ -27,60 +26,60 @@ def register_user():
             status_code=HTTPStatus.BAD_REQUEST
         )
     
-    with Session() as session:
-        try:
-            existing_user = session.query(User).filter_by(email=data["email"]).first()
-    
-            if existing_user:
-                return response_template(
-                    message="User already exists",
-                    data=existing_user.as_dict(),
-                    status_code=HTTPStatus.OK
-                )
-            
-            hardcoded_password = "123456"
-            
-            # Hash the password
-            hashed_password = bcrypt.hashpw(hardcoded_password.encode('utf-8'), bcrypt.gensalt())
-            
-            # Create a new user 
-            new_user = User(
-                id=data["id"], 
-                username=data['username'],
-                email=data['email'],
-                picture=data.get("picture"),
-                password_hash=hashed_password.decode('utf-8'),  # Store as string
-            )
-            
-            session.add(new_user)
-            session.commit()
-        
-            # Return the new user's information (excluding password)
-            user_data = new_user.as_dict()
-            user_data.pop('password_hash', None)  # Ensure password hash is not returned
+    session = SessionLocal()
+    try:
+        existing_user = session.query(User).filter_by(email=data["email"]).first()
+
+        if existing_user:
             return response_template(
-                message="User registered successfully",
-                data=user_data,
-                status_code=HTTPStatus.CREATED
+                message="User already exists",
+                data=existing_user.as_dict(),
+                status_code=HTTPStatus.OK
             )
         
-        except IntegrityError as e:
-            return response_template(
-                message="Integrity error",
-                error=f"An unexpected error occurred: {str(e)}",
-                status_code=HTTPStatus.INTERNAL_SERVER_ERROR
-            )
+        hardcoded_password = "123456"
         
-        except SQLAlchemyError as e:
-            return response_template(
-                message="Database error",
-                error=f"An unexpected error occurred: {str(e)}",
-                status_code=HTTPStatus.INTERNAL_SERVER_ERROR
-            )
+        # Hash the password
+        hashed_password = bcrypt.hashpw(hardcoded_password.encode('utf-8'), bcrypt.gensalt())
         
-        except Exception as e:
-            return response_template(
-                message="An unexpected error occurred",
-                error=f"An unexpected error occurred: {str(e)}",
-                status_code=HTTPStatus.INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+        # Create a new user 
+        new_user = User(
+            id=data["id"], 
+            username=data['username'],
+            email=data['email'],
+            picture=data.get("picture"),
+            password_hash=hashed_password.decode('utf-8'),  # Store as string
+        )
+        
+        session.add(new_user)
+        session.commit()
+    
+        # Return the new user's information (excluding password)
+        user_data = new_user.as_dict()
+        user_data.pop('password_hash', None)  # Ensure password hash is not returned
+        return response_template(
+            message="User registered successfully",
+            data=user_data,
+            status_code=HTTPStatus.CREATED
+        )
+    
+    except IntegrityError as e:
+        return response_template(
+            message="Integrity error",
+            error=f"An unexpected error occurred: {str(e)}",
+            status_code=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
+    
+    except SQLAlchemyError as e:
+        return response_template(
+            message="Database error",
+            error=f"An unexpected error occurred: {str(e)}",
+            status_code=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
+    
+    except Exception as e:
+        return response_template(
+            message="An unexpected error occurred",
+            error=f"An unexpected error occurred: {str(e)}",
+            status_code=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
\ No newline at end of file
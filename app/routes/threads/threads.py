@@ -1,10 +1,10 @@
 # Endpoints for threads
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request
 from app.utils.response_template import response_template
 from http import HTTPStatus
-from config import Session, Thread
-from app.penelope.penelope import penelope_manager
+from config import SessionLocal, Thread
+from app.penelope.penelope import get_penelope
 
 
 threads_bp = Blueprint('threads', __name__)
@@ -39,7 +39,6 @@ def start_new_chat():
         )
 
     user_id = data.get('user_id')
-    print('user_id: ', user_id)
     
     if not user_id:
         return response_template(
@@ -49,8 +48,7 @@ def start_new_chat():
         )
     
     try:
-        result = penelope_manager.create_new_thread(user_id)
-        print('result: ', result)
+        result = get_penelope().create_new_thread(user_id)
         if result['success']:
             return response_template(
                 message=result['message'],
@@ -85,28 +83,28 @@ def get_threads(user_id):
         400: Bad request if user_id is missing.
         500: Internal server error if an exception occurs.
     """
-    with Session() as session:
-        try:
-            threads = session.query(Thread).filter_by(user_id=user_id).order_by(Thread.created_at.desc()).all()
-            if not threads:
-                return response_template(
-                    message="No threads found for the user",
-                    status_code=HTTPStatus.NOT_FOUND
-                )
-            
-            thread_data = [thread.as_dict() for thread in threads]
+    session = SessionLocal()
+    try:
+        threads = session.query(Thread).filter_by(user_id=user_id).order_by(Thread.created_at.desc()).all()
+        if not threads:
             return response_template(
-                message="Threads retrieved successfully",
-                data=thread_data,
-                status_code=HTTPStatus.OK
-            )
-        except Exception as e:
-            session.rollback()
-            return response_template(   
-                message='Internal Server Error',
-                error=f'An unexpected error occurred: {str(e)}',
-                status_code=HTTPStatus.INTERNAL_SERVER_ERROR
+                message="No threads found for the user",
+                status_code=HTTPStatus.NOT_FOUND
             )
+        
+        thread_data = [thread.as_dict() for thread in threads]
+        return response_template(
+            message="Threads retrieved successfully",
+            data=thread_data,
+            status_code=HTTPStatus.OK
+        )
+    except Exception as e:
+        session.rollback()
+        return response_template(   
+            message='Internal Server Error',
+            error=f'An unexpected error occurred: {str(e)}',
+            status_code=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 
 @threads_bp.route('/threads/<thread_id>', methods=['PUT'])
@@ -147,21 +145,21 @@ def update_thread_title(thread_id):
         )
 
     try:
-        with Session() as session:
-            thread = session.query(Thread).filter_by(id=thread_id).first()
-            if not thread:
-                return response_template(
-                    message="Thread not found",
-                    error="Thread with the specified ID does not exist",
-                    status_code=HTTPStatus.NOT_FOUND
-                )
-            thread.title = title
-            session.commit()
+        session = SessionLocal()
+        thread = session.query(Thread).filter_by(id=thread_id).first()
+        if not thread:
             return response_template(
-                message="Thread title updated successfully",
-                data=thread.as_dict(),
-                status_code=HTTPStatus.OK
+                message="Thread not found",
+                error="Thread with the specified ID does not exist",
+                status_code=HTTPStatus.NOT_FOUND
             )
+        thread.title = title
+        session.commit()
+        return response_template(
+            message="Thread title updated successfully",
+            data=thread.as_dict(),
+            status_code=HTTPStatus.OK
+        )
     except Exception as e:
         session.rollback()
         return response_template(
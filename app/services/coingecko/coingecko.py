@@ -1,6 +1,8 @@
 import os
 import re
+import logging
 import requests
+from app.utils.http_client import build_retrying_session
 from dateutil import parser
 from difflib import SequenceMatcher
 from datetime import datetime, timedelta
@@ -15,25 +17,29 @@ COINGECKO_HEADERS = {
     "x-cg-pro-api-key": COINGECKO_API_KEY,
 }
 
+logger = logging.getLogger(__name__)
+
 
 class CoinGeckoAPI:
-    def __init__(self, coingecko_headers: Dict[str, str], coingecko_base_url: str, verbose: bool = False):
+    def __init__(self, coingecko_headers: Dict[str, str], coingecko_base_url: str, verbose: bool = False, session: Optional[requests.Session] = None):
         """
         Initialize the CoinGeckoAPI class.
 
         Args:
             coingecko_headers (Dict[str, str]): Headers for API requests.
             coingecko_base_url (str): Base URL for the CoinGecko API.
-            verbose (bool): If True, print debug messages.
+            verbose (bool): If True, log debug messages.
+            session (Optional[requests.Session]): Shared HTTP session; a retrying session is created if omitted.
         """
         self.coingecko_headers = coingecko_headers
         self.coingecko_base_url = coingecko_base_url
         self.verbose = verbose
+        self.session = session or build_retrying_session()
 
-    def _debug_print(self, message: str):
-        """Print debug messages if verbose is True."""
+    def _debug_print(self, message: str, *args):
+        """Log a debug message if verbose is True; `args` are formatted lazily by logging."""
         if self.verbose:
-            print(f"DEBUG: {message}")
+            logger.debug(message, *args)
 
     def convert_to_date(self, natural_language_date: str) -> str:
         """
@@ -45,7 +51,7 @@ class CoinGeckoAPI:
         Returns:
             str: Formatted date string (DD-MM-YYYY).
         """
-        self._debug_print(f"Converting date: {natural_language_date}")
+        self._debug_print("Converting date: %s", natural_language_date)
         now = datetime.now()
 
         # Handle specific relative dates
@@ -91,7 +97,7 @@ class CoinGeckoAPI:
 
         parsed_date = parser.parse(natural_language_date)
         formatted_date = parsed_date.strftime("%d-%m-%Y")
-        self._debug_print(f"Converted date: {formatted_date}")
+        self._debug_print("Converted date: %s", formatted_date)
         return formatted_date
 
     def get_list_of_coins(self) -> Optional[List[Dict]]:
@@ -104,11 +110,11 @@ class CoinGeckoAPI:
         self._debug_print("Fetching list of coins")
         try:
             url = f"{self.coingecko_base_url}/coins/list"
-            response = requests.get(url, headers=self.coingecko_headers)
+            response = self.session.get(url, headers=self.coingecko_headers)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
-            self._debug_print(f"Error fetching list of coins: {str(e)}")
+            self._debug_print("Error fetching list of coins: %s", e)
             return None
 
     def get_coin_history(self, coin_id: str, date: Optional[str] = None) -> Optional[List[Dict]]:
@@ -122,7 +128,7 @@ class CoinGeckoAPI:
         Returns:
             Optional[List[Dict]]: List of dictionaries containing historical data, or None if not found.
         """
-        self._debug_print(f"Fetching history for coin: {coin_id}, date: {date}")
+        self._debug_print("Fetching history for coin: %s, date: %s", coin_id, date)
         COINGECKO_PRO_API_URL = 'https://pro-api.coingecko.com/api/v3/coins'
         formatted_coin_id = coin_id.casefold().strip()
         list_coins_ids = self.get_list_of_coins()
@@ -147,13 +153,13 @@ class CoinGeckoAPI:
             if not ids:
                 return 'Please specify the token as you find it on crypto websites'
             
-            self._debug_print(f"Matching IDs: {ids}")
+            self._debug_print("Matching IDs: %s", ids)
             
             for id in ids:
                 url = f'{COINGECKO_PRO_API_URL}/{id}/history'
                 try:
-                    response = requests.get(url, params=params, headers=self.coingecko_headers)
-                    self._debug_print(f"Response status for {id}: {response.status_code}")
+                    response = self.session.get(url, params=params, headers=self.coingecko_headers)
+                    self._debug_print("Response status for %s: %s", id, response.status_code)
                     if response.status_code == 200:
                         data = response.json()
                         market_cap = data.get('market_data', {}).get('market_cap', {}).get('usd')
@@ -167,11 +173,11 @@ class CoinGeckoAPI:
                             }
                             coins_data_historical.append(coin_data)
                         else:
-                            self._debug_print(f'Market cap for {coin_id} on {date} is below threshold or not available.')
+                            self._debug_print('Market cap for %s on %s is below threshold or not available.', coin_id, date)
                 except requests.RequestException as e:
-                    self._debug_print(f"Request error for {coin_id}: {str(e)}")
+                    self._debug_print("Request error for %s: %s", coin_id, e)
                 except KeyError as e:
-                    self._debug_print(f"Key error for {coin_id}: {str(e)}")
+                    self._debug_print("Key error for %s: %s", coin_id, e)
             
             return coins_data_historical if coins_data_historical else 'Unable to get historical data'
 
@@ -199,7 +205,7 @@ class CoinGeckoAPI:
         Returns:
             List[str]: List of IDs matching the parameter.
         """
-        self._debug_print(f"Finding best matches for: {param}")
+        self._debug_print("Finding best matches for: %s", param)
         matches: List[str] = []
         highest_similarity = 0.0
         for coin in coins:
@@ -222,7 +228,7 @@ class CoinGeckoAPI:
         Returns:
             Optional[List[Dict]]: List of dictionaries containing coin data, or None if not found.
         """
-        self._debug_print(f"Fetching token data for: {coin}")
+        self._debug_print("Fetching token data for: %s", coin)
         try:
             formatted_coin = coin.casefold().strip()
             coins = self.get_list_of_coins()
@@ -241,7 +247,7 @@ class CoinGeckoAPI:
                 'sparkline': 'false'
             }
             url = f"{self.coingecko_base_url}/coins/markets"
-            response = requests.get(url, params=params, headers=self.coingecko_headers)
+            response = self.session.get(url, params=params, headers=self.coingecko_headers)
             
             if response.status_code == 200:
                 response_data = response.json()
@@ -281,13 +287,13 @@ class CoinGeckoAPI:
                 
                 return coins_data_list if coins_data_list else None
             else:
-                self._debug_print(f"Error fetching token data: Status code {response.content}")
+                self._debug_print("Error fetching token data: Status code %s", response.content)
                 return f"Error fetching token data: Status code {response.content}"
         except requests.RequestException as e:
-            self._debug_print(f"Error fetching token data: {str(e)}")
+            self._debug_print("Error fetching token data: %s", e)
             return f"Error fetching token data: {str(e)}"
         except KeyError as e:
-            self._debug_print(f"Key error: {str(e)}")
+            self._debug_print("Key error: %s", e)
             return f"Key error: {str(e)}"
 
 
@@ -1,8 +1,12 @@
 import os
+import logging
 import requests
+from app.utils.http_client import build_retrying_session
 from difflib import SequenceMatcher
 from typing import Optional, List, Dict
 
+logger = logging.getLogger(__name__)
+
 COINGECKO_API_KEY = os.getenv("COINGECKO_API_KEY")
 COINGECKO_BASE_URL = "https://api.coingecko.com/api/v3"
 COINGECKO_HEADERS = {
@@ -11,10 +15,11 @@ COINGECKO_HEADERS = {
 }
 
 class LlamaChainFetcher:
-    def __init__(self, coingecko_headers, coingecko_base_url):
+    def __init__(self, coingecko_headers, coingecko_base_url, session: Optional[requests.Session] = None):
         self.url = "https://api.llama.fi/v2/chains"
         self.coingecko_headers = coingecko_headers
         self.coingecko_base_url = coingecko_base_url
+        self.session = session or build_retrying_session()
 
     def get_list_of_coins(self) -> Optional[List[Dict]]:
         """
@@ -26,7 +31,7 @@ class LlamaChainFetcher:
         """
         try:
             url = f"{self.coingecko_base_url}/coins/list"
-            response = requests.get(url, headers=self.coingecko_headers)
+            response = self.session.get(url, headers=self.coingecko_headers)
             response.raise_for_status()  # Raise an error for bad responses
 
             if response.status_code == 200:
@@ -34,7 +39,7 @@ class LlamaChainFetcher:
             return None
 
         except requests.RequestException as e:
-            print(f"Error fetching list of coins: {str(e)}")
+            logger.error("Error fetching list of coins: %s", e)
             return None
 
     def similarity(self, a: str, b: str) -> float:
@@ -83,13 +88,13 @@ class LlamaChainFetcher:
 
             coins = self.get_list_of_coins()
             if coins is None:
-                print("Failed to fetch coins list")
+                logger.error("Failed to fetch coins list")
                 return None
             
             coins_list = self.find_best_match_ids(param=formatted_token_id, coins=coins)
             coins_tvl = []
         
-            response = requests.get(self.url)
+            response = self.session.get(self.url)
 
             if response.status_code == 200:
                 chains = response.json()
@@ -108,11 +113,11 @@ class LlamaChainFetcher:
             return coins_tvl
         
         except requests.RequestException as e:
-            print(f"Request error: {str(e)}")
+            logger.error("Request error: %s", e)
             return None
         
         except Exception as e:
-            print(f"An unexpected error occurred: {str(e)}")
+            logger.error("An unexpected error occurred: %s", e)
             return None
 
     @staticmethod
@@ -1,15 +1,19 @@
 import os
+import logging
 from typing import Dict, Generator, Optional
 import google.generativeai as genai
 
+logger = logging.getLogger(__name__)
+
 class GeminiAPI:
     def __init__(self, verbose: bool = False):
         self.api_key: str = os.getenv("GEMINI_API_KEY")
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY is not set in the environment variables")
         
-        # Configure Gemini AI
-        genai.configure(api_key=self.api_key)
+        # Configure Gemini AI. The default gRPC transport waits in its C core, which
+        # gevent can't make cooperative; REST goes through patched sockets instead.
+        genai.configure(api_key=self.api_key, transport="rest")
         
         self.verbose = verbose
         self.model = genai.GenerativeModel('gemini-1.0-pro-latest')
@@ -30,7 +34,7 @@ class GeminiAPI:
         Dict[str, str]: Chunks of the response or error messages.
         """
         if self.verbose:
-            print("Generating Gemini response...")
+            logger.debug("Generating Gemini response...")
 
         # Combine system prompt and user prompt if both are provided
         combined_prompt = f"{system_prompt}\n\n{user_prompt}" if system_prompt else user_prompt
@@ -49,7 +53,7 @@ class GeminiAPI:
         """
         try:
             if self.verbose:
-                print("Sending request to Gemini API...")
+                logger.debug("Sending request to Gemini API...")
             
             # Generate content based on the prompt
             response = self.model.generate_content(prompt, stream=True)
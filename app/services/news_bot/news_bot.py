@@ -1,8 +1,12 @@
 import os
+import logging
 import requests
+from app.utils.http_client import build_retrying_session
 from typing import List, Dict, Optional, Set
 from difflib import SequenceMatcher
 
+logger = logging.getLogger(__name__)
+
 COINGECKO_API_KEY = os.getenv("COINGECKO_API_KEY")
 NEWS_BOT_V2_URL = os.getenv("NEWS_BOT_V2_URL")
 AI_ALPHA_MAIN_SERVER_URL = os.getenv("AI_ALPHA_MAIN_SERVER_URL")
@@ -14,7 +18,8 @@ coingecko_headers = {
         }
 
 class CoinNewsFetcher:
-    def __init__(self):
+    def __init__(self, session: Optional[requests.Session] = None):
+        self.session = session or build_retrying_session()
         self.coins = self.get_list_of_coins()
         self.all_bots = self.get_bots()
 
@@ -102,7 +107,7 @@ class CoinNewsFetcher:
                 List[Dict] or None: A sorted list of coins in JSON format if successful, None otherwise.
             """
             try:
-                coingecko_response = requests.get(f"{COINGECKO_BASE_URL}/coins/list", headers=coingecko_headers)
+                coingecko_response = self.session.get(f"{COINGECKO_BASE_URL}/coins/list", headers=coingecko_headers)
                 coingecko_response.raise_for_status()  # Raise an error for 4xx/5xx status codes
                 coins_list = coingecko_response.json()
                 
@@ -126,7 +131,7 @@ class CoinNewsFetcher:
             headers = {"accept": "application/json"}
 
             try:
-                response = requests.get(url, headers=headers)
+                response = self.session.get(url, headers=headers)
                 response.raise_for_status()  # Raise an exception for 4xx/5xx status codes
                 return response.json() 
             except requests.exceptions.RequestException as e:
@@ -159,7 +164,7 @@ class CoinNewsFetcher:
                 url = f"{NEWS_BOT_V2_URL}/get_articles?bot_id={bot_id}&limit={limit}"
 
                 try:
-                    response = requests.get(url)
+                    response = self.session.get(url)
                     response.raise_for_status()
 
                     data = response.json().get('data', [])
@@ -167,7 +172,7 @@ class CoinNewsFetcher:
                         news_list.append({'news': article['content'], 'date': article['date']})
 
                 except requests.exceptions.RequestException as e:
-                    print(f"Error fetching articles for bot_id {bot_id}: {e}")
+                    logger.error("Error fetching articles for bot_id %s: %s", bot_id, e)
                     continue
 
         return news_list if news_list else None
@@ -1,13 +1,18 @@
 import os
+import logging
 from typing import Dict, Generator, Optional
+import httpx
 from openai import APIError, RateLimitError, APIConnectionError, OpenAI
+from app.utils.http_client import openai_http_client
+
+logger = logging.getLogger(__name__)
 
 class ChatGPTAPI:
-    def __init__(self, verbose: bool = False):
+    def __init__(self, verbose: bool = False, http_client: Optional[httpx.Client] = None):
         self.api_key: str = os.getenv('OPENAI_API_KEY')
         if not self.api_key:
             raise ValueError("OPENAI_API_KEY is not set in the environment variables")
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = OpenAI(api_key=self.api_key, http_client=http_client or openai_http_client)
         self.verbose = verbose
 
     def generate_response(
@@ -32,7 +37,7 @@ class ChatGPTAPI:
         Dict[str, str]: Chunks of the response or error messages.
         """
         if self.verbose:
-            print(f"Generating ChatGPT response, model: {model}")
+            logger.debug("Generating ChatGPT response, model: %s", model)
 
         messages = [{"role": "user", "content": user_prompt}]
         if system_prompt:
@@ -61,7 +66,7 @@ class ChatGPTAPI:
         """
         try:
             if self.verbose:
-                print("Sending request to OpenAI API...")
+                logger.debug("Sending request to OpenAI API...")
             response = self.client.chat.completions.create(
                 model=model,
                 messages=messages,
@@ -1,16 +1,21 @@
 import os
+import logging
 from typing import Dict, Generator, Optional
 import httpx
-import json
+import orjson
+from app.utils.http_client import provider_http_client
+
+logger = logging.getLogger(__name__)
 
 class PerplexityAPI:
     API_URL: str = "https://api.perplexity.ai/chat/completions"
 
-    def __init__(self, verbose: bool = False):
+    def __init__(self, verbose: bool = False, http_client: Optional[httpx.Client] = None):
         self.api_key: str = os.getenv("PERPLEXITY_API_KEY")
         if not self.api_key:
             raise ValueError("PERPLEXITY_API_KEY is not set in the environment variables")
         self.verbose = verbose
+        self.http_client = http_client or provider_http_client
 
     def generate_response(
         self,
@@ -30,7 +35,7 @@ class PerplexityAPI:
         Dict[str, str]: Chunks of the API response.
         """
         if self.verbose:
-            print(f"\nGenerating Perplexity response, model: {model}")
+            logger.debug("Generating Perplexity response, model: %s", model)
 
         messages = [{"role": "user", "content": user_prompt}]
         if system_prompt:
@@ -62,22 +67,21 @@ class PerplexityAPI:
         Dict[str, str]: Chunks of the API response.
         """
         try:
-            with httpx.Client(timeout=httpx.Timeout(300.0)) as client:
+            if self.verbose:
+                logger.debug("Sending request to Perplexity API...")
+            with self.http_client.stream("POST", self.API_URL, json=payload, headers=headers) as response:
+                response.raise_for_status()
                 if self.verbose:
-                    print("Sending request to Perplexity API...")
-                with client.stream("POST", self.API_URL, json=payload, headers=headers) as response:
-                    response.raise_for_status()
-                    if self.verbose:
-                        print(f"Response status code: {response.status_code}")
-                    for line in response.iter_lines():
-                        if line:
-                            try:
-                                json_data = json.loads(line[6:])
-                                content = json_data.get('choices', [{}])[0].get('delta', {}).get('content')
-                                if content:
-                                    yield {"perplexity_response": content}
-                            except json.JSONDecodeError:
-                                yield {"error": "Failed to parse JSON response"}
+                    logger.debug("Response status code: %s", response.status_code)
+                for line in response.iter_lines():
+                    if line:
+                        try:
+                            json_data = orjson.loads(line[6:])
+                            content = json_data.get('choices', [{}])[0].get('delta', {}).get('content')
+                            if content:
+                                yield {"perplexity_response": content}
+                        except orjson.JSONDecodeError:
+                            yield {"error": "Failed to parse JSON response"}
         except httpx.HTTPStatusError as e:
             yield {"error": f"HTTP error occurred: {e.response.status_code} {e.response.reason_phrase}"}
         except httpx.RequestError as e:
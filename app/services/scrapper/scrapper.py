@@ -1,12 +1,17 @@
 import requests
+from app.utils.http_client import build_retrying_session
 from bs4 import BeautifulSoup
 from typing import Optional
 
 class Scraper:
-    def __init__(self):
+    # Returned instead of page content when the site refuses the request
+    ACCESS_DENIED = "The URL denied access"
+
+    def __init__(self, session: Optional[requests.Session] = None):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'
         }
+        self.session = session or build_retrying_session()
 
     def extract_data(self, url: str, format: Optional[str] = 'txt') -> str:
         """
@@ -24,7 +29,7 @@ class Scraper:
             RuntimeError: If the request fails or if an invalid format is specified.
         """
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url, headers=self.headers)
            
             if response.status_code == 200:
                 if format == 'html':
@@ -35,7 +40,7 @@ class Scraper:
                 else:
                     raise ValueError("Invalid return format. Use 'html' or 'txt'.")
             
-            return "The URL denied access"
+            return self.ACCESS_DENIED
 
         except requests.exceptions.RequestException as e:
             raise RuntimeError(f"Request failed in scraper: {e}")
@@ -0,0 +1,80 @@
+"""
+# Shared HTTP clients
+"""
+
+import atexit
+import os
+import httpx
+import requests
+from openai import DefaultHttpxClient
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# A single pooled client shared by every OpenAI SDK instance in the process, so
+# requests reuse keep-alive connections (and HTTP/2 streams) instead of paying
+# a TCP + TLS handshake on each call.
+openai_http_client = DefaultHttpxClient(
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+)
+
+# Pooled client for the other streaming LLM providers called over plain HTTP
+# (Perplexity). Streams can run for minutes, hence the long read timeout.
+provider_http_client = httpx.Client(
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+    timeout=httpx.Timeout(300.0, connect=5.0),
+)
+
+# Close pooled connections cleanly when the worker exits.
+atexit.register(openai_http_client.close)
+atexit.register(provider_http_client.close)
+
+
+class CappedRetry(Retry):
+    """
+    `Retry` that honors `Retry-After` only up to `max_retry_after` seconds.
+
+    Tool calls run while an assistant stream is open, so a provider asking for a
+    minute-long pause must not hold the calling thread that long.
+    """
+
+    max_retry_after = float(os.getenv("MAX_RETRY_AFTER", 5))
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, self.max_retry_after)
+
+
+def build_retrying_session(retries: int = 3, backoff_factor: float = 0.5, pool_maxsize: int = 10) -> requests.Session:
+    """
+    Build a `requests.Session` that retries transient provider failures.
+
+    Idempotent requests that fail with a connection error, 429 or 5xx are retried
+    with exponential backoff and jitter, honoring any `Retry-After` header up to
+    `CappedRetry.max_retry_after` seconds.
+
+    Args:
+        retries (int): Maximum number of retries per request.
+        backoff_factor (float): Base delay in seconds for the exponential backoff.
+        pool_maxsize (int): Keep-alive connections kept per host.
+
+    Returns:
+        requests.Session: A session with the retrying adapter mounted for http and https.
+    """
+    retry = CappedRetry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        backoff_jitter=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_maxsize=pool_maxsize)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
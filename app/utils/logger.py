@@ -0,0 +1,45 @@
+"""
+# Application logging
+"""
+
+import atexit
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging(level: Optional[str] = None) -> QueueListener:
+    """
+    Route the `app` logger through a queue drained by a background thread.
+
+    Log calls on request threads only enqueue the record; the listener thread
+    does the formatting and the write to stderr, so streaming responses never
+    block on log I/O.
+
+    Args:
+        level (Optional[str]): Log level name. Defaults to the LOG_LEVEL environment variable, or DEBUG.
+
+    Returns:
+        QueueListener: The running listener (created once per process).
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("[%(asctime)s]-%(name)s-%(message)s", "%Y-%m-%d %H:%M:%S"))
+
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(level or os.getenv("LOG_LEVEL", "DEBUG"))
+    app_logger.addHandler(QueueHandler(log_queue))
+    app_logger.propagate = False
+
+    _listener = QueueListener(log_queue, stream_handler)
+    _listener.start()
+    atexit.register(_listener.stop)
+    return _listener
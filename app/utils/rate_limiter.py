@@ -0,0 +1,49 @@
+"""
+# Client-side rate limiting
+"""
+
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket allowing `rate` units per `period` seconds.
+
+    Callers block in `acquire` until enough capacity is available, so bursts of
+    concurrent requests are spread out instead of tripping provider 429s.
+    """
+
+    def __init__(self, rate: float, period: float = 60.0):
+        """
+        Args:
+            rate (float): Units (requests or tokens) allowed per period; also the burst size.
+            period (float): Length of the window in seconds (default: one minute).
+        """
+        self.capacity = float(rate)
+        self.fill_rate = self.capacity / period
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, units: float = 1) -> None:
+        """
+        Block until `units` are available, then consume them.
+
+        Requests larger than the bucket are capped at its capacity so they can
+        still proceed once the bucket is full.
+
+        Args:
+            units (float): Units to consume (default: 1 request).
+        """
+        units = min(float(units), self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.fill_rate)
+                self._updated = now
+                if self._tokens >= units:
+                    self._tokens -= units
+                    return
+                wait = (units - self._tokens) / self.fill_rate
+            time.sleep(wait)
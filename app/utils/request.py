@@ -0,0 +1,31 @@
+"""
+# Request class for file uploads
+"""
+
+import os
+from io import BytesIO
+from tempfile import TemporaryFile
+from typing import IO, Optional
+
+from flask import Request
+
+# Request bodies up to this many bytes are parsed in memory; larger ones go to a temp file
+UPLOAD_IN_MEMORY_MAX_SIZE = int(os.getenv("UPLOAD_IN_MEMORY_MAX_SIZE", 2 * 1024 * 1024))
+
+
+class UploadRequest(Request):
+    """
+    Flask request that keeps small uploads in memory.
+
+    Werkzeug spools any form body over 500 KB to disk, so a typical PDF is written
+    to a temp file and read back again before it is streamed to OpenAI. This raises
+    the threshold to `UPLOAD_IN_MEMORY_MAX_SIZE`. Larger bodies, and bodies of
+    unknown length, go straight to a temp file instead of being buffered in memory
+    first, so a request never holds more than the threshold in memory.
+    """
+
+    def _get_file_stream(self, total_content_length: Optional[int], content_type: Optional[str],
+                         filename: Optional[str] = None, content_length: Optional[int] = None) -> IO[bytes]:
+        if total_content_length is not None and total_content_length <= UPLOAD_IN_MEMORY_MAX_SIZE:
+            return BytesIO()
+        return TemporaryFile("rb+")
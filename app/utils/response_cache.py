@@ -0,0 +1,67 @@
+"""
+# Response cache for repeated prompts
+"""
+
+import hashlib
+import threading
+from typing import Optional
+
+from cachetools import TTLCache
+
+
+class ResponseCache:
+    """
+    In-process, exact-match cache of provider responses.
+
+    Prompts are normalized (case and whitespace) before hashing, so trivially
+    different phrasings of the same question share an entry. Entries are keyed
+    only by provider and prompt, so a cached answer is served to every user who
+    asks the same thing until it expires after `ttl` seconds. Answers about
+    prices or news go stale within that window, so keep the TTL short or leave
+    the cache disabled (`ttl` <= 0, the default) when that matters.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 0):
+        """
+        Args:
+            maxsize (int): Maximum number of cached responses.
+            ttl (float): Seconds a cached response stays valid; 0 or less disables the cache.
+        """
+        self.enabled = ttl > 0
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl) if self.enabled else None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(service: str, prompt: str) -> str:
+        normalized = " ".join(prompt.lower().split())
+        return f"{service}:{hashlib.sha1(normalized.encode('utf-8')).hexdigest()}"
+
+    def get(self, service: str, prompt: str) -> Optional[str]:
+        """
+        Return the cached response of `service` for `prompt`, if any.
+
+        Args:
+            service (str): Provider name (e.g. "gemini").
+            prompt (str): The user prompt.
+
+        Returns:
+            Optional[str]: The cached response, or None on a miss or when the cache is disabled.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            return self._cache.get(self._key(service, prompt))
+
+    def put(self, service: str, prompt: str, response: str) -> None:
+        """
+        Store the complete response of `service` for `prompt`.
+
+        Args:
+            service (str): Provider name (e.g. "gemini").
+            prompt (str): The user prompt.
+            response (str): The full response text.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._cache[self._key(service, prompt)] = response
@@ -0,0 +1,63 @@
+"""
+# Streaming helpers
+"""
+
+import time
+from typing import Any, Dict, Iterable, Iterator
+
+
+def coalesce_chunks(events: Iterable[Dict[str, Any]], max_delay: float = 0.015, max_chars: int = 256) -> Iterator[Dict[str, Any]]:
+    """
+    Merge consecutive text chunks of a Penelope stream into fewer, larger events.
+
+    Tokens often arrive faster than a client can render them, and every event
+    costs a JSON encode, an SSE frame and a socket write. Consecutive `chunk`
+    events of the same response are buffered and emitted together once the
+    buffer is `max_chars` long or `max_delay` seconds old. Any other event
+    (errors, thread notices) flushes the buffer first and passes through as is,
+    so event order and boundaries are preserved.
+
+    The deadline is checked as events arrive, so a buffered chunk is flushed by
+    the next event or by the end of the stream at the latest.
+
+    Args:
+        events (Iterable[Dict[str, Any]]): Events built with `penelope_response_template`.
+        max_delay (float): Longest time in seconds a chunk is held back.
+        max_chars (int): Buffer size in characters that triggers a flush.
+
+    Yields:
+        Dict[str, Any]: The events, with adjacent text chunks merged.
+    """
+    parts = []
+    size = 0
+    chunk_id = None
+    deadline = 0.0
+
+    for event in events:
+        if event.get('type') == 'chunk' and (not parts or event.get('id') == chunk_id):
+            if not parts:
+                chunk_id = event.get('id')
+                deadline = time.monotonic() + max_delay
+            message = event.get('message') or ''
+            parts.append(message)
+            size += len(message)
+            if size >= max_chars or time.monotonic() >= deadline:
+                yield {'message': ''.join(parts), 'id': chunk_id, 'type': 'chunk'}
+                parts, size = [], 0
+            continue
+
+        if parts:
+            yield {'message': ''.join(parts), 'id': chunk_id, 'type': 'chunk'}
+            parts, size = [], 0
+
+        if event.get('type') == 'chunk':
+            # A chunk of a different response starts a new buffer
+            chunk_id = event.get('id')
+            deadline = time.monotonic() + max_delay
+            parts.append(event.get('message') or '')
+            size = len(parts[0])
+        else:
+            yield event
+
+    if parts:
+        yield {'message': ''.join(parts), 'id': chunk_id, 'type': 'chunk'}
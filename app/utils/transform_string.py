@@ -1,3 +1,8 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+
 def transform_string(input_string: str) -> str:
     """
     Transforms the input string by:
@@ -43,7 +48,7 @@ def transform_string(input_string: str) -> str:
         return result
 
     except TypeError as e:
-        print(f"Error transforming string: {e}")
+        logger.warning("Error transforming string: %s", e)
         return ""
 
 # Test the function with different types of input
@@ -3,8 +3,9 @@ from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Bool
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import relationship
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, scoped_session
 from sqlalchemy import create_engine
+from greenlet import getcurrent
 from datetime import datetime
 import uuid
 
@@ -207,8 +208,32 @@ class File(Base):
         return {column.name: getattr(self, column.name) for column in self.__table__.columns}
     
 
-engine = create_engine(Config.SQLALCHEMY_DATABASE_URI)
-Session = sessionmaker(bind=engine)
+# Sessions are opened per operation from many request threads, so size the pool
+# for concurrency, validate connections on checkout, and recycle them before the
+# server drops idle ones. LIFO checkout keeps reusing the same warm connections,
+# so surplus ones sit idle and get recycled during quiet periods. Each gunicorn
+# worker has its own pool: workers * (pool_size + max_overflow) must stay below
+# Postgres' max_connections.
+engine = create_engine(
+    Config.SQLALCHEMY_DATABASE_URI,
+    pool_size=int(os.environ.get('DB_POOL_SIZE', 20)),
+    max_overflow=int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+    pool_timeout=int(os.environ.get('DB_POOL_TIMEOUT', 30)),
+    pool_pre_ping=True,
+    pool_recycle=1800,
+    pool_use_lifo=True,
+)
+# Sessions here are short-lived and mostly write-then-commit: disable autoflush so
+# reads don't emit hidden flushes, and keep loaded attributes usable after commit
+# instead of re-SELECTing them.
+Session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+# Request handlers share one session per request, scoped to the current greenlet
+# (under gevent workers each request runs in its own greenlet, and under threads
+# each thread has its own), so a connection is never shared between concurrent
+# requests. Route code just calls `SessionLocal()`; the app removes the session
+# on teardown so its connection always goes back to the pool. Background work
+# (e.g. Penelope's persist executor) opens its own sessions from `Session`.
+SessionLocal = scoped_session(Session, scopefunc=getcurrent)
 Base.metadata.create_all(engine)
 
 
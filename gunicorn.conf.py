@@ -0,0 +1,32 @@
+"""
+# Gunicorn configuration
+
+Streaming inference responses hold their connection open for the whole
+generation, which is almost entirely waiting on the LLM providers. gevent
+workers serve those streams cooperatively, so one worker process handles many
+concurrent streams instead of one per sync worker.
+"""
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+worker_class = "gevent"
+# Concurrency comes from greenlets, so one process per core is enough; each
+# process keeps its own DB pool, so more workers also means more connections.
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_connections = int(os.getenv("WORKER_CONNECTIONS", 1000))
+# Long-running streams are normal here; don't kill workers mid-generation
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 600))
+graceful_timeout = 30
+keepalive = 5
+
+
+# The gevent worker monkey-patches the stdlib, which covers clients built on Python
+# sockets (requests, httpx). Clients with their own C networking are not covered:
+# Gemini is configured with the REST transport instead of gRPC for that reason.
+def post_fork(server, worker):
+    # psycopg2 is a C extension that gevent's monkey patching can't reach; make
+    # its socket waits cooperative so a slow query doesn't block the worker.
+    from psycogreen.gevent import patch_psycopg
+    patch_psycopg()